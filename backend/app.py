@@ -1,18 +1,26 @@
 # backend/app.py
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, g, Response, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import io
 import os
+import hmac
+import hashlib
 import json
 import logging
+import threading
 from datetime import datetime
 import uuid
+from collections import deque
 
 # Import our modules
 from config import get_config, Config
 from models.rag_model import RAGModel
 from models.chat_model import ChatModel
+from models.semantic_cache import SemanticCache
 from utils.analytics import AnalyticsTracker
 from utils.pdf_generator import PDFGenerator
+from utils.json_utils import json_loads, json_dumps, append_jsonl, extend_jsonl
 
 # Configure logging
 logging.basicConfig(
@@ -21,8 +29,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class CompactJSONProvider(JSONProvider):
+    """Serialize API payloads as compact JSON through the fast codec in utils.json_utils"""
+    
+    def dumps(self, obj, **kwargs):
+        return json_dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return json_loads(s)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = CompactJSONProvider(app)
 
 # Load configuration
 config = get_config()
@@ -43,40 +61,123 @@ except ValueError as e:
 CORS(app, origins=config.CORS_ORIGINS)
 
 # Initialize components
-rag_model = RAGModel()
-chat_model = ChatModel()
-analytics = AnalyticsTracker()
+rag_model = RAGModel(cache_dir=config.RAG_CACHE_DIR)
+chat_model = ChatModel(semantic_cache=SemanticCache(rag_model.encode_query,
+                                                    threshold=config.SEMANTIC_CACHE_THRESHOLD,
+                                                    max_size=config.SEMANTIC_CACHE_SIZE))
+analytics = AnalyticsTracker(batch_size=config.ANALYTICS_BATCH_SIZE)
 pdf_generator = PDFGenerator()
 
+# Config values used by request handlers, bound once instead of looked up per request
+_RESUME_DATA_FILE = config.RESUME_DATA_FILE
+_CONVERSATIONS_FILE = config.CONVERSATIONS_FILE
+_MAX_CHAT_HISTORY = config.MAX_CHAT_HISTORY
+_UPLOADED_RESUME_PDF = os.path.join(config.RESUMES_DIR, 'sai_resume.pdf')
+_GENERATED_RESUMES_DIR = config.GENERATED_RESUMES_DIR
+_GENERATED_RESUME_MAX_AGE = config.GENERATED_RESUME_MAX_AGE
+
+def _migrate_legacy_conversations():
+    """Import the conversations.json kept before the JSONL log into the log, once"""
+    legacy_file = os.path.join(os.path.dirname(_CONVERSATIONS_FILE), 'conversations.json')
+    migrated_file = f"{legacy_file}.migrated"
+    try:
+        # Renaming first claims the file, so only one process imports it
+        os.rename(legacy_file, migrated_file)
+    except FileNotFoundError:
+        return
+    
+    try:
+        with open(migrated_file, 'rb') as f:
+            conversations = json_loads(f.read())
+        extend_jsonl(_CONVERSATIONS_FILE, conversations[-_MAX_CHAT_HISTORY:], max_lines=_MAX_CHAT_HISTORY)
+        logger.info(f"Migrated {len(conversations)} conversations from {legacy_file}")
+    except Exception as e:
+        logger.error(f"Failed to migrate legacy conversations: {str(e)}")
+
+_migrate_legacy_conversations()
+
+# Resolved once so disabled analytics (tests, benchmarks) cost a single flag check per request
+_ANALYTICS_ENABLED = config.ANALYTICS_ENABLED
+
+# Expected admin Authorization header, encoded once for constant-time comparison
+_EXPECTED_AUTH = f"Bearer {config.ADMIN_PASSWORD}".encode('utf-8')
+
+def _require_admin():
+    """Check the request's Authorization header against the admin password"""
+    auth_header = request.headers.get('Authorization', '')
+    return hmac.compare_digest(auth_header.encode('utf-8'), _EXPECTED_AUTH)
+
+# Top-level sections an admin resume update must contain
+REQUIRED_RESUME_SECTIONS = frozenset(('personal_info', 'experience', 'education', 'skills', 'projects'))
+
+# Parsed JSON files keyed by path -> (st_mtime_ns, data)
+_JSON_CACHE = {}
+_JSON_CACHE_LOCK = threading.Lock()
+
 def load_json_file(filepath, default=None):
-    """Load JSON file with error handling"""
+    """Load JSON file with error handling, cached until the file's mtime changes"""
+    # Cached objects are shared between requests, so callers must not mutate them
+    if default is None:
+        default = {}
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        mtime_ns = os.stat(filepath).st_mtime_ns
+        with _JSON_CACHE_LOCK:
+            cached = _JSON_CACHE.get(filepath)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with open(filepath, 'rb') as f:
+            data = json_loads(f.read())
+        with _JSON_CACHE_LOCK:
+            _JSON_CACHE[filepath] = (mtime_ns, data)
+        return data
     except FileNotFoundError:
         logger.warning(f"File not found: {filepath}")
-        return default or {}
+        return default
     except json.JSONDecodeError:
         logger.error(f"Invalid JSON in file: {filepath}")
-        return default or {}
+        return default
 
 def save_json_file(filepath, data):
-    """Save data to JSON file with error handling"""
+    """Save data to JSON file atomically, skipping the write when content is unchanged"""
     try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        data_bytes = json_dumps(data, pretty=True)
+        
+        try:
+            if os.path.getsize(filepath) == len(data_bytes):
+                with open(filepath, 'rb') as f:
+                    if f.read() == data_bytes:
+                        return True
+        except FileNotFoundError:
+            pass
+        
+        # Write to a temp file and rename so readers never see a partial file
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+        
+        with _JSON_CACHE_LOCK:
+            _JSON_CACHE[filepath] = (os.stat(filepath).st_mtime_ns, data)
         return True
     except Exception as e:
         logger.error(f"Error saving file {filepath}: {str(e)}")
         return False
 
+@app.before_request
+def _stamp_request():
+    """Read the clock once per request; handlers reuse g.now / g.now_iso"""
+    g.now = datetime.now()
+    g.now_iso = g.now.isoformat()
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': g.now_iso,
         'services': {
             'rag_model': rag_model.is_ready(),
             'chat_model': chat_model.is_ready()
@@ -87,15 +188,14 @@ def health_check():
 def get_resume_data():
     """Get resume data for frontend"""
     try:
-        resume_data = load_json_file(config.RESUME_DATA_FILE)
+        resume_data = load_json_file(_RESUME_DATA_FILE)
         
-        # Track page view
-        visitor_info = {
-            'ip': request.remote_addr,
-            'user_agent': request.headers.get('User-Agent'),
-            'timestamp': datetime.now().isoformat()
-        }
-        analytics.track_visit(visitor_info)
+        # Track page view (the tracker stamps its own timestamp)
+        if _ANALYTICS_ENABLED:
+            analytics.track_visit({
+                'ip': request.remote_addr,
+                'user_agent': request.headers.get('User-Agent')
+            })
         
         return jsonify({
             'success': True,
@@ -108,6 +208,20 @@ def get_resume_data():
             'error': 'Failed to load resume data'
         }), 500
 
+def _retrieve_context(message, selected_text):
+    """RAG context for a chat message, or '' while embeddings are still warming up"""
+    _sync_resume_data()
+    if not rag_model.is_ready():
+        return ''
+    return rag_model.get_relevant_context(message, selected_text)
+
+def _save_conversation(conversation):
+    """Append a chat exchange to the conversation log; a failed write never fails the chat"""
+    try:
+        append_jsonl(_CONVERSATIONS_FILE, conversation, max_lines=_MAX_CHAT_HISTORY)
+    except Exception as e:
+        logger.error(f"Failed to save conversation: {str(e)}")
+
 @app.route('/api/chat', methods=['POST'])
 def chat_endpoint():
     """Handle chat requests with RAG"""
@@ -116,7 +230,7 @@ def chat_endpoint():
         message = data.get('message', '').strip()
         mode = data.get('mode', 'strict')  # 'strict' or 'open'
         context = data.get('context', '')  # Selected text or current section
-        session_id = data.get('session_id', str(uuid.uuid4()))
+        session_id = data.get('session_id') or uuid.uuid4().hex  # Only generate an id for new sessions
         
         if not message:
             return jsonify({
@@ -124,33 +238,30 @@ def chat_endpoint():
                 'error': 'Message cannot be empty'
             }), 400
         
-        # Get RAG context
-        rag_context = rag_model.get_relevant_context(message, context)
-        
-        # Generate response
+        # Generate response; RAG context is only retrieved when the semantic
+        # cache doesn't already hold an answer to this question
         response = chat_model.generate_response(
             message=message,
             mode=mode,
-            context=rag_context,
-            selected_text=context
+            selected_text=context,
+            retrieve=_retrieve_context
         )
         
         # Save conversation
         conversation = {
             'session_id': session_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': g.now_iso,
             'message': message,
             'response': response,
             'mode': mode,
             'context': context
         }
         
-        conversations = load_json_file(config.CONVERSATIONS_FILE, [])
-        conversations.append(conversation)
-        save_json_file(config.CONVERSATIONS_FILE, conversations[-100:])  # Keep last 100
+        _save_conversation(conversation)
         
         # Track chat interaction
-        analytics.track_chat_interaction(session_id, message, mode)
+        if _ANALYTICS_ENABLED:
+            analytics.track_chat_interaction(session_id, message, mode)
         
         return jsonify({
             'success': True,
@@ -166,6 +277,68 @@ def chat_endpoint():
             'error': 'Failed to process chat message'
         }), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream_endpoint():
+    """Handle chat requests with RAG, streaming the answer as server-sent events"""
+    try:
+        data = request.json
+        message = data.get('message', '').strip()
+        mode = data.get('mode', 'strict')  # 'strict' or 'open'
+        context = data.get('context', '')  # Selected text or current section
+        session_id = data.get('session_id') or uuid.uuid4().hex
+        
+        if not message:
+            return jsonify({
+                'success': False,
+                'error': 'Message cannot be empty'
+            }), 400
+        
+        timestamp = g.now_iso
+        
+        def generate():
+            chunks = []
+            for chunk in chat_model.generate_response_stream(
+                message=message,
+                mode=mode,
+                selected_text=context,
+                retrieve=_retrieve_context
+            ):
+                chunks.append(chunk)
+                yield b'data: ' + json_dumps({'delta': chunk}) + b'\n\n'
+            
+            response = ''.join(chunks)
+            conversation = {
+                'session_id': session_id,
+                'timestamp': timestamp,
+                'message': message,
+                'response': response,
+                'mode': mode,
+                'context': context
+            }
+            _save_conversation(conversation)
+            
+            if _ANALYTICS_ENABLED:
+                analytics.track_chat_interaction(session_id, message, mode)
+            
+            yield b'data: ' + json_dumps({
+                'done': True,
+                'session_id': session_id,
+                'suggestions': chat_model.get_follow_up_suggestions(message, response)
+            }) + b'\n\n'
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in chat stream endpoint: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to process chat message'
+        }), 500
+
 @app.route('/api/explain-text', methods=['POST'])
 def explain_text():
     """Explain selected text using AI"""
@@ -196,19 +369,20 @@ def explain_text():
             'error': 'Failed to explain text'
         }), 500
 
-@app.route('/api/download-resume', methods=['POST'])
+@app.route('/api/download-resume', methods=['GET', 'POST'])
 def download_resume():
     """Generate and download resume PDF"""
     try:
-        data = request.json
+        # GET (?type=...) lets browsers revalidate with If-None-Match and get a 304; POST is kept for older clients
+        data = request.args if request.method == 'GET' else request.json
         resume_type = data.get('type', 'uploaded')  # 'uploaded' or 'dynamic'
         
         if resume_type == 'uploaded':
             # Return the uploaded PDF
-            pdf_path = os.path.join(config.RESUMES_DIR, 'sai_resume.pdf')
-            if os.path.exists(pdf_path):
-                return send_file(pdf_path, as_attachment=True, 
-                               download_name='Sai_Teja_Reddy_Resume.pdf')
+            if os.path.exists(_UPLOADED_RESUME_PDF):
+                return send_file(_UPLOADED_RESUME_PDF, as_attachment=True, 
+                               download_name='Sai_Teja_Reddy_Resume.pdf',
+                               conditional=True)
             else:
                 return jsonify({
                     'success': False,
@@ -216,12 +390,30 @@ def download_resume():
                 }), 404
         
         elif resume_type == 'dynamic':
-            # Generate PDF from website data
-            resume_data = load_json_file(config.RESUME_DATA_FILE)
-            pdf_path = pdf_generator.generate_resume_pdf(resume_data)
+            # Generate PDF from website data, reusing the file built for identical data and layout
+            resume_data = load_json_file(_RESUME_DATA_FILE)
+            digest = hashlib.blake2b(f"{PDFGenerator.LAYOUT_VERSION}\n".encode('utf-8') + json_dumps(resume_data, sort_keys=True),
+                                     digest_size=16).hexdigest()
+            pdf_path = os.path.join(_GENERATED_RESUMES_DIR, f'resume_{digest}.pdf')
+            
+            if not os.path.exists(pdf_path):
+                # Build in memory and serve those bytes directly; the file is only kept for later requests
+                pdf_bytes = pdf_generator.generate_resume_pdf(resume_data, as_bytes=True)
+                
+                tmp_path = f"{pdf_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(pdf_bytes)
+                os.replace(tmp_path, pdf_path)
+                
+                return send_file(io.BytesIO(pdf_bytes), mimetype='application/pdf', as_attachment=True,
+                               download_name='Sai_Teja_Reddy_Dynamic_Resume.pdf',
+                               etag=digest, conditional=True,
+                               max_age=_GENERATED_RESUME_MAX_AGE)
             
             return send_file(pdf_path, as_attachment=True,
-                           download_name='Sai_Teja_Reddy_Dynamic_Resume.pdf')
+                           download_name='Sai_Teja_Reddy_Dynamic_Resume.pdf',
+                           etag=digest, conditional=True,
+                           max_age=_GENERATED_RESUME_MAX_AGE)
         
         else:
             return jsonify({
@@ -241,8 +433,7 @@ def get_analytics():
     """Get analytics data for admin dashboard"""
     try:
         # Verify admin access (simple password check)
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or auth_header != f"Bearer {config.ADMIN_PASSWORD}":
+        if not _require_admin():
             return jsonify({'error': 'Unauthorized'}), 401
         
         analytics_data = analytics.get_analytics_summary()
@@ -261,27 +452,28 @@ def get_analytics():
 @app.route('/api/admin/update-resume', methods=['POST'])
 def update_resume_data():
     """Update resume data (admin only)"""
+    global _rag_resume_mtime
     try:
         # Verify admin access
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or auth_header != f"Bearer {config.ADMIN_PASSWORD}":
+        if not _require_admin():
             return jsonify({'error': 'Unauthorized'}), 401
         
         new_data = request.json
         
         # Validate data structure (basic validation)
-        required_sections = ['personal_info', 'experience', 'education', 'skills', 'projects']
-        for section in required_sections:
-            if section not in new_data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Missing required section: {section}'
-                }), 400
+        missing = REQUIRED_RESUME_SECTIONS.difference(new_data)
+        if missing:
+            return jsonify({
+                'success': False,
+                'error': f'Missing required sections: {", ".join(sorted(missing))}'
+            }), 400
         
         # Save updated data
-        if save_json_file(config.RESUME_DATA_FILE, new_data):
-            # Refresh RAG model with new data
-            rag_model.refresh_embeddings(new_data)
+        if save_json_file(_RESUME_DATA_FILE, new_data):
+            # Refresh this worker now; the others notice the new mtime on their next chat request
+            with _RAG_SYNC_LOCK:
+                _rag_resume_mtime = _resume_mtime()
+                _apply_resume_update(new_data)
             
             return jsonify({
                 'success': True,
@@ -300,20 +492,35 @@ def update_resume_data():
             'error': 'Failed to update resume data'
         }), 500
 
+def _stream_conversations(lines):
+    """Yield the conversations response body, splicing stored JSONL records in without re-parsing them"""
+    yield b'{"success":true,"conversations":['
+    first = True
+    for line in lines:
+        if not line.endswith(b'\n'):
+            continue  # Record still being appended
+        if not first:
+            yield b','
+        yield line.rstrip(b'\n')
+        first = False
+    yield b']}'
+
 @app.route('/api/conversations', methods=['GET'])
 def get_conversations():
     """Get conversation history (admin only)"""
     try:
         # Verify admin access
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or auth_header != f"Bearer {config.ADMIN_PASSWORD}":
+        if not _require_admin():
             return jsonify({'error': 'Unauthorized'}), 401
         
-        conversations = load_json_file(config.CONVERSATIONS_FILE, [])
-        return jsonify({
-            'success': True,
-            'conversations': conversations
-        })
+        try:
+            with open(_CONVERSATIONS_FILE, 'rb') as f:
+                lines = deque(f, maxlen=_MAX_CHAT_HISTORY)
+        except FileNotFoundError:
+            lines = ()
+        
+        return Response(stream_with_context(_stream_conversations(lines)),
+                        mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error getting conversations: {str(e)}")
@@ -325,6 +532,9 @@ def get_conversations():
 @app.route('/api/analytics/track', methods=['POST'])
 def track_analytics():
     """Track custom analytics events"""
+    if not _ANALYTICS_ENABLED:
+        return jsonify({'success': True})
+    
     try:
         data = request.json
         events = data.get('events', [])
@@ -353,308 +563,70 @@ def track_analytics():
         logger.error(f"Error tracking analytics: {str(e)}")
         return jsonify({'success': False}), 500
 
-if __name__ == '__main__':
-    # Initialize RAG model on startup
-    try:
-        resume_data = load_json_file(config.RESUME_DATA_FILE)
-        if resume_data:
-            rag_model.initialize_embeddings(resume_data)
-            logger.info("RAG model initialized successfully")
-        else:
-            logger.warning("No resume data found for RAG initialization")
-    except Exception as e:
-        logger.error(f"Failed to initialize RAG model: {str(e)}")
-    
-    # Run the app
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=config.DEBUG)
+# mtime of the resume data this process's RAG index and semantic cache were built from.
+# Each gunicorn worker has its own copies, so workers compare it with the file to pick up
+# updates saved by another worker (or made before a recycled worker was forked).
+_rag_resume_mtime = None
+_RAG_SYNC_LOCK = threading.Lock()
 
-def load_json_file(filepath, default=None):
-    """Load JSON file with error handling"""
+def _resume_mtime():
+    """mtime_ns of the resume data file, or None if it is missing"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return os.stat(_RESUME_DATA_FILE).st_mtime_ns
     except FileNotFoundError:
-        logger.warning(f"File not found: {filepath}")
-        return default or {}
-    except json.JSONDecodeError:
-        logger.error(f"Invalid JSON in file: {filepath}")
-        return default or {}
-
-def save_json_file(filepath, data):
-    """Save data to JSON file with error handling"""
-    try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        logger.error(f"Error saving file {filepath}: {str(e)}")
-        return False
-
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'services': {
-            'rag_model': rag_model.is_ready(),
-            'chat_model': chat_model.is_ready()
-        }
-    })
-
-@app.route('/api/resume-data', methods=['GET'])
-def get_resume_data():
-    """Get resume data for frontend"""
-    try:
-        resume_data = load_json_file(RESUME_DATA_FILE)
-        
-        # Track page view
-        visitor_info = {
-            'ip': request.remote_addr,
-            'user_agent': request.headers.get('User-Agent'),
-            'timestamp': datetime.now().isoformat()
-        }
-        analytics.track_visit(visitor_info)
-        
-        return jsonify({
-            'success': True,
-            'data': resume_data
-        })
-    except Exception as e:
-        logger.error(f"Error getting resume data: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to load resume data'
-        }), 500
-
-@app.route('/api/chat', methods=['POST'])
-def chat_endpoint():
-    """Handle chat requests with RAG"""
-    try:
-        data = request.json
-        message = data.get('message', '').strip()
-        mode = data.get('mode', 'strict')  # 'strict' or 'open'
-        context = data.get('context', '')  # Selected text or current section
-        session_id = data.get('session_id', str(uuid.uuid4()))
-        
-        if not message:
-            return jsonify({
-                'success': False,
-                'error': 'Message cannot be empty'
-            }), 400
-        
-        # Get RAG context
-        rag_context = rag_model.get_relevant_context(message, context)
-        
-        # Generate response
-        response = chat_model.generate_response(
-            message=message,
-            mode=mode,
-            context=rag_context,
-            selected_text=context
-        )
-        
-        # Save conversation
-        conversation = {
-            'session_id': session_id,
-            'timestamp': datetime.now().isoformat(),
-            'message': message,
-            'response': response,
-            'mode': mode,
-            'context': context
-        }
-        
-        conversations = load_json_file(CONVERSATIONS_FILE, [])
-        conversations.append(conversation)
-        save_json_file(CONVERSATIONS_FILE, conversations[-100:])  # Keep last 100
-        
-        # Track chat interaction
-        analytics.track_chat_interaction(session_id, message, mode)
-        
-        return jsonify({
-            'success': True,
-            'response': response,
-            'session_id': session_id,
-            'suggestions': chat_model.get_follow_up_suggestions(message, response)
-        })
-        
-    except Exception as e:
-        logger.error(f"Error in chat endpoint: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to process chat message'
-        }), 500
+        return None
 
-@app.route('/api/explain-text', methods=['POST'])
-def explain_text():
-    """Explain selected text using AI"""
-    try:
-        data = request.json
-        selected_text = data.get('text', '').strip()
-        section = data.get('section', '')
-        
-        if not selected_text:
-            return jsonify({
-                'success': False,
-                'error': 'No text selected'
-            }), 400
-        
-        # Get explanation using RAG
-        explanation = chat_model.explain_text(selected_text, section)
-        
-        return jsonify({
-            'success': True,
-            'explanation': explanation,
-            'original_text': selected_text
-        })
-        
-    except Exception as e:
-        logger.error(f"Error explaining text: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to explain text'
-        }), 500
+def _apply_resume_update(resume_data):
+    """Rebuild this process's index from new resume data and drop answers about the old one"""
+    rag_model.refresh_embeddings(resume_data)
+    if chat_model.semantic_cache is not None:
+        chat_model.semantic_cache.clear()
 
-@app.route('/api/download-resume', methods=['POST'])
-def download_resume():
-    """Generate and download resume PDF"""
-    try:
-        data = request.json
-        resume_type = data.get('type', 'uploaded')  # 'uploaded' or 'dynamic'
-        
-        if resume_type == 'uploaded':
-            # Return the uploaded PDF
-            pdf_path = os.path.join('..', 'frontend', 'resumes', 'sai_resume.pdf')
-            if os.path.exists(pdf_path):
-                return send_file(pdf_path, as_attachment=True, 
-                               download_name='Sai_Teja_Reddy_Resume.pdf')
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': 'Uploaded resume not found'
-                }), 404
-        
-        elif resume_type == 'dynamic':
-            # Generate PDF from website data
-            resume_data = load_json_file(RESUME_DATA_FILE)
-            pdf_path = pdf_generator.generate_resume_pdf(resume_data)
-            
-            return send_file(pdf_path, as_attachment=True,
-                           download_name='Sai_Teja_Reddy_Dynamic_Resume.pdf')
-        
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Invalid resume type'
-            }), 400
-            
-    except Exception as e:
-        logger.error(f"Error downloading resume: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to generate resume'
-        }), 500
-
-@app.route('/api/analytics', methods=['GET'])
-def get_analytics():
-    """Get analytics data for admin dashboard"""
-    try:
-        # Verify admin access (simple password check)
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or auth_header != f"Bearer {os.getenv('ADMIN_PASSWORD')}":
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        analytics_data = analytics.get_analytics_summary()
-        return jsonify({
-            'success': True,
-            'data': analytics_data
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting analytics: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to load analytics'
-        }), 500
-
-@app.route('/api/admin/update-resume', methods=['POST'])
-def update_resume_data():
-    """Update resume data (admin only)"""
-    try:
-        # Verify admin access
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or auth_header != f"Bearer {os.getenv('ADMIN_PASSWORD')}":
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        new_data = request.json
-        
-        # Validate data structure (basic validation)
-        required_sections = ['personal_info', 'experience', 'education', 'skills', 'projects']
-        for section in required_sections:
-            if section not in new_data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Missing required section: {section}'
-                }), 400
-        
-        # Save updated data
-        if save_json_file(RESUME_DATA_FILE, new_data):
-            # Refresh RAG model with new data
-            rag_model.refresh_embeddings(new_data)
-            
-            return jsonify({
-                'success': True,
-                'message': 'Resume data updated successfully'
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Failed to save resume data'
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"Error updating resume data: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to update resume data'
-        }), 500
-
-@app.route('/api/conversations', methods=['GET'])
-def get_conversations():
-    """Get conversation history (admin only)"""
+def _sync_resume_data():
+    """Apply a resume update saved by another process, if there is one"""
+    global _rag_resume_mtime
+    if _rag_resume_mtime is None or _resume_mtime() == _rag_resume_mtime:
+        return  # Still bootstrapping, or up to date
+    
+    # One request per process rebuilds; concurrent ones carry on with the current index
+    if not _RAG_SYNC_LOCK.acquire(blocking=False):
+        return
     try:
-        # Verify admin access
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or auth_header != f"Bearer {os.getenv('ADMIN_PASSWORD')}":
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        conversations = load_json_file(CONVERSATIONS_FILE, [])
-        return jsonify({
-            'success': True,
-            'conversations': conversations
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting conversations: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Failed to load conversations'
-        }), 500
+        mtime = _resume_mtime()
+        if mtime != _rag_resume_mtime:
+            _rag_resume_mtime = mtime
+            logger.info("Resume data changed on disk; refreshing embeddings")
+            _apply_resume_update(load_json_file(_RESUME_DATA_FILE))
+    finally:
+        _RAG_SYNC_LOCK.release()
 
-if __name__ == '__main__':
-    # Initialize RAG model on startup
+def _bootstrap_rag():
+    """Build the RAG index from the stored resume data"""
+    global _rag_resume_mtime
     try:
-        resume_data = load_json_file(RESUME_DATA_FILE)
+        mtime = _resume_mtime()
+        resume_data = load_json_file(_RESUME_DATA_FILE)
         if resume_data:
             rag_model.initialize_embeddings(resume_data)
             logger.info("RAG model initialized successfully")
         else:
             logger.warning("No resume data found for RAG initialization")
+        _rag_resume_mtime = mtime
     except Exception as e:
         logger.error(f"Failed to initialize RAG model: {str(e)}")
-    
+
+if config.RAG_BOOTSTRAP == 'sync':
+    # Preloaded gunicorn master: build the index before workers fork. Wait for the model
+    # warm-up thread as well, so no thread is midway through loading it (holding its lock)
+    # when the workers are forked
+    rag_model.embedding_model
+    _bootstrap_rag()
+else:
+    # Build embeddings in the background so the server binds immediately;
+    # chat answers without retrieved context until the index is ready
+    threading.Thread(target=_bootstrap_rag, name='rag-bootstrap', daemon=True).start()
+
+if __name__ == '__main__':
     # Run the app
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_ENV') == 'development')
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=config.DEBUG)
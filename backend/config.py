@@ -1,5 +1,6 @@
 # backend/config.py
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -24,16 +25,21 @@ class Config:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     DATA_DIR = os.path.join(BASE_DIR, 'data')
     RESUME_DATA_FILE = os.path.join(DATA_DIR, 'resume_data.json')
-    CONVERSATIONS_FILE = os.path.join(DATA_DIR, 'conversations.json')
-    ANALYTICS_FILE = os.path.join(DATA_DIR, 'analytics.json')
-    EMBEDDINGS_FILE = os.path.join(DATA_DIR, 'embeddings.json')
+    CONVERSATIONS_FILE = os.path.join(DATA_DIR, 'conversations.jsonl')
+    ANALYTICS_FILE = os.path.join(DATA_DIR, 'aggregate.json')
+    RAG_CACHE_DIR = os.path.join(DATA_DIR, 'rag_cache')
     
     # Resume Generation
     FRONTEND_DIR = os.path.join(os.path.dirname(BASE_DIR), 'frontend')
     RESUMES_DIR = os.path.join(FRONTEND_DIR, 'resumes')
     GENERATED_RESUMES_DIR = os.path.join(RESUMES_DIR, 'generated')
+    GENERATED_RESUME_MAX_AGE = 3600  # Cache-Control max-age for generated PDFs (seconds)
+    
+    # Let a fronting web server stream files (X-Sendfile); only enable behind one that supports it
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', '0') == '1'
     
     # RAG Configuration
+    RAG_BOOTSTRAP = os.getenv('RAG_BOOTSTRAP', 'background')  # 'sync' builds the index at import time
     EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
     MAX_CONTEXT_LENGTH = 2048
     TOP_K_RESULTS = 5
@@ -43,20 +49,20 @@ class Config:
     MAX_CHAT_HISTORY = 100
     DEFAULT_TEMPERATURE = 0.7
     MAX_RESPONSE_TOKENS = 512
+    SEMANTIC_CACHE_THRESHOLD = 0.87  # Cosine similarity above which a cached answer is reused
+    SEMANTIC_CACHE_SIZE = 256
     
     # Analytics Configuration
+    ANALYTICS_ENABLED = os.getenv('ANALYTICS_ENABLED', '1') == '1'
     MAX_VISITS_STORED = 1000
     MAX_CHATS_STORED = 500
-    ANALYTICS_BATCH_SIZE = 10
-    
-    # CORS Configuration
-    CORS_ORIGINS = [
-        "http://localhost:5500",
-        "http://127.0.0.1:5500",
-        "https://*.netlify.app",
-        "https://*.herokuapp.com",
-        "https://*.railway.app"
-    ]
+    ANALYTICS_BATCH_SIZE = 128
+    
+    # CORS Configuration (one anchored pattern: local Live Server plus hosted subdomains)
+    CORS_ORIGINS = re.compile(
+        r'^(?:http://(?:localhost|127\.0\.0\.1):5500'
+        r'|https://[^/]+\.(?:netlify\.app|herokuapp\.com|railway\.app))$'
+    )
     
     # Rate Limiting
     RATE_LIMIT_ENABLED = True
@@ -0,0 +1,32 @@
+# backend/gunicorn_conf.py
+import os
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Threaded workers: chat requests mostly wait on the Together API
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+worker_class = 'gthread'
+threads = 8
+timeout = 60
+
+# Load the app (and build the RAG index) once in the master before forking,
+# so workers share the read-only embeddings through copy-on-write pages
+preload_app = True
+os.environ.setdefault('RAG_BOOTSTRAP', 'sync')
+
+# The master encodes the resume before forking. An OpenMP thread pool started there is not
+# usable in the forked workers and can hang their first encode, so the master runs torch
+# single-threaded and each worker sizes its own pool after the fork
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+torch_threads = max(1, (os.cpu_count() or 1) // workers)
+
+def post_fork(server, worker):
+    """Give the new worker its share of torch intra-op threads"""
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(torch_threads)
+
+# Recycle workers periodically to bound memory growth
+max_requests = 1000
+max_requests_jitter = 100
@@ -6,5 +6,6 @@ Contains RAG model and chat model implementations.
 
 from .rag_model import RAGModel
 from .chat_model import ChatModel
+from .semantic_cache import SemanticCache
 
-__all__ = ['RAGModel', 'ChatModel']
\ No newline at end of file
+__all__ = ['RAGModel', 'ChatModel', 'SemanticCache']
\ No newline at end of file
@@ -1,20 +1,199 @@
 # backend/models/chat_model.py
 import os
+import atexit
+import asyncio
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import re
+import hashlib
 import logging
-from typing import Dict, List, Any
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from cachetools import TTLCache
+from .semantic_cache import SemanticCache
+from utils.json_utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+def _build_session() -> requests.Session:
+    """Keep-alive connection pool that retries connection failures and gateway errors"""
+    retry = Retry(
+        total=2,
+        read=0,  # A slow completion is not retried; that would multiply the wait
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(['POST']),
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    return session
+
+# Shared across ChatModel instances so the TLS connection to Together stays warm between calls
+_SESSION = _build_session()
+atexit.register(_SESSION.close)
+
+def _cache_key(*parts: str) -> bytes:
+    """Compact fixed-size cache key for arbitrarily long text inputs"""
+    return hashlib.blake2b("|".join(parts).encode('utf-8'), digest_size=16).digest()
+
+def _clean(text: str) -> str:
+    """Collapse the source indentation and line breaks of a triple-quoted literal"""
+    return " ".join(text.split())
+
+# Canned answers used when the Together API is unavailable, cleaned once at import
+_EXPERIENCE_FALLBACK = _clean("""I have 5+ years of hands-on AI/ML engineering experience, including 2.5 years at Ericsson Canada 
+            where I built production-scale AI systems supporting 100M+ daily events. I specialize in LLM fine-tuning, 
+            RAG systems, and deploying ML models in cloud environments. Would you like to know more about any specific project?""")
+
+_SKILLS_FALLBACK = _clean("""I'm proficient in Python, TensorFlow, PyTorch, Hugging Face, AWS, and MLOps tools. I've deployed 
+            models using SageMaker, built CI/CD pipelines, and worked extensively with big data tools like Spark and Kafka. 
+            My recent projects include LLM classification fine-tuning and multilingual speech recognition systems.""")
+
+_EDUCATION_FALLBACK = _clean("""I'm currently pursuing a Master's in Computer Science with AI focus at Oklahoma Christian University. 
+            I also have a PG Diploma in IT Business Analysis from Conestoga College and a B.Tech in Electronics & Communication 
+            from JNTU Hyderabad. I was always a top performer in mathematics and competitive exams.""")
+
+_PROJECTS_FALLBACK = _clean("""I've worked on fascinating projects including LLM fine-tuning for classification, Thai speech recognition 
+            with translation, telecom network diagnostics using AI, and fraud detection systems. Each project demonstrates my 
+            ability to solve real-world problems using cutting-edge AI techniques. Which project interests you most?""")
+
+_DEFAULT_FALLBACK = _clean("""I'm Sai Teja Reddy's AI assistant! I'm here to tell you about his impressive background as an AI/ML Engineer 
+            with 5 years of production experience. He's passionate about using technology to solve real problems and help others. 
+            What would you like to know about his experience, skills, or projects?""")
+
+_EXPLANATION_FALLBACK = _clean("""This highlights Sai's expertise in {section}. The phrase "{text}" demonstrates his 
+        hands-on experience and technical depth. This kind of experience shows he can deliver real results 
+        and has the practical knowledge that employers value. Would you like me to elaborate on any specific 
+        aspect of this achievement?""")
+
+# (keywords, answer) pairs checked in order. Keywords match anywhere in the lowercased
+# question, so inflections like "experiences" or "skillset" count; one alternation per branch
+_FALLBACK_TABLE = (
+    (re.compile("experience|work|job|career"), _EXPERIENCE_FALLBACK),
+    (re.compile("skills|technologies|tools"), _SKILLS_FALLBACK),
+    (re.compile("education|degree|university"), _EDUCATION_FALLBACK),
+    (re.compile("project"), _PROJECTS_FALLBACK)
+)
+
+_SUGGESTION_BRANCHES = (
+    (re.compile("experience|work"), (
+        "Tell me more about the Ericsson Canada role",
+        "What was his biggest achievement at work?",
+        "How did he improve system performance?"
+    )),
+    (re.compile("skills|technical"), (
+        "What AI/ML frameworks does he use?",
+        "Tell me about his cloud experience",
+        "What's his experience with LLMs?"
+    )),
+    (re.compile("education|university"), (
+        "What's his academic background?",
+        "Tell me about his mathematics skills",
+        "What certifications does he have?"
+    )),
+    (re.compile("project"), (
+        "Show me his recent projects",
+        "What's his most impressive project?",
+        "Tell me about his Kaggle work"
+    ))
+)
+_DEFAULT_SUGGESTIONS = (
+    "What makes him a great AI engineer?",
+    "Tell me about his leadership experience",
+    "What are his career goals?"
+)
+
 class ChatModel:
-    def __init__(self):
+    # Explanations are regenerated after an hour so wording can evolve with the resume
+    EXPLAIN_CACHE_SIZE = 2048
+    EXPLAIN_CACHE_TTL = 3600
+    
+    # (connect, read) timeouts: fail fast on an unreachable host, allow time for generation
+    REQUEST_TIMEOUT = (3.05, 30)
+    
+    # Prompts are constant per mode; built once rather than concatenated per request
+    _BASE_CONTEXT = """
+        You are Sai Teja Reddy's AI assistant, representing him on his interactive resume website. 
+        You have access to his complete professional background and personal information.
+        
+        Key facts about Sai:
+        - AI/ML Engineer with 5 years of production experience
+        - Currently pursuing Master's in AI at Oklahoma Christian University
+        - Worked at Ericsson Canada as ML Engineer (2022-2024)
+        - Previously at Cash4You Inc. as Data Scientist (2021-2022)
+        - Passionate about technology, space, mathematics, and helping others
+        - Loves teaching, mentoring, and using technology to better society
+        - Wants to adopt and educate 10 underprivileged children
+        - Enjoys movies, camping, fishing, adventure activities
+        - Expert in Python, TensorFlow, PyTorch, AWS, MLOps, and LLM fine-tuning
+        """
+    
+    _SYSTEM_PROMPTS = {
+        "strict": _BASE_CONTEXT + """
+            
+            STRICT MODE RULES:
+            1. ONLY answer questions related to Sai's resume, career, skills, and professional background
+            2. ALWAYS highlight Sai's strengths and positive aspects
+            3. If asked about weaknesses or negative topics, redirect to related strengths
+            4. Keep responses professional and focused on his qualifications
+            5. If asked about non-resume topics, politely redirect back to his professional profile
+            6. NEVER mention any negative information or limitations
+            7. Always connect answers back to why Sai would be a great hire
+            8. Be enthusiastic and confident about his abilities
+            """,
+        "open": _BASE_CONTEXT + """
+            
+            OPEN MODE RULES:
+            1. You can discuss any topic, but always try to relate it back to Sai's interests and skills
+            2. Maintain a positive, helpful tone
+            3. Share Sai's perspectives on technology, AI ethics, education, and social impact
+            4. If discussing non-professional topics, connect them to his personality and values
+            5. Show his curiosity about space, technology, and life's big questions
+            6. Demonstrate his passion for helping others and making a positive impact
+            7. Keep conversations engaging while subtly showcasing his expertise
+            8. Always be authentic to his personality - jovial, helpful, and knowledgeable
+            """
+    }
+    
+    # Negative wording rewritten before a response is shown; other phrases are left as-is
+    _NEGATIVE_TUPLE = ("weakness", "can't", "cannot")
+    _NEG_RE = re.compile(r"\b(weakness|can't|cannot)")
+    # A phrase starting this far from the end of streamed text may still be incomplete
+    _NEG_HOLDBACK = max(map(len, _NEGATIVE_TUPLE)) - 1
+    _NEG_SUB = {
+        "weakness": "area for growth that shows my commitment to improvement",
+        "can't": "am always learning about",
+        "cannot": "am continuously developing skills in"
+    }
+    
+    _POSITIVE_ENDINGS = (
+        "I'd be happy to tell you more about this!",
+        "This is one of the areas where I really excel.",
+        "I'm always excited to discuss this topic further!",
+        "Feel free to ask me anything else about my experience.",
+        "This showcases exactly the kind of impact I love to make."
+    )
+    _POS_RE = re.compile("|".join(map(re.escape, _POSITIVE_ENDINGS)), re.IGNORECASE)
+    
+    def __init__(self, session: requests.Session = None, semantic_cache: SemanticCache = None):
         """Initialize chat model with Together API"""
         self.api_key = os.getenv('TOGETHER_API_KEY')
         self.api_url = "https://api.together.xyz/v1/chat/completions"
         self.model_name = "meta-llama/Llama-2-7b-chat-hf"  # Free tier model
         self.ready = bool(self.api_key)
+        self.session = session if session is not None else _SESSION
+        self.semantic_cache = semantic_cache
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._explain_cache = TTLCache(maxsize=self.EXPLAIN_CACHE_SIZE, ttl=self.EXPLAIN_CACHE_TTL)
+        self._explain_cache_lock = threading.Lock()
+        self._async_client = None
         
         if not self.ready:
             logger.error("Together API key not found!")
@@ -26,45 +205,156 @@ class ChatModel:
         return self.ready
     
     def generate_response(self, message: str, mode: str = "strict", 
-                         context: str = "", selected_text: str = "") -> str:
-        """Generate AI response based on mode and context"""
+                         context: str = "", selected_text: str = "",
+                         retrieve: Optional[Callable[[str, str], str]] = None) -> str:
+        """Generate AI response based on mode and context.
+
+        `retrieve(message, selected_text)`, if given, supplies the context and is only
+        called when the semantic cache has no answer.
+        """
         try:
             if not self.is_ready():
                 return "Sorry, the AI chat system is currently unavailable. Please try again later."
             
-            # Build system prompt based on mode
-            system_prompt = self._get_system_prompt(mode)
+            cached, key_embedding, cache_namespace = self._lookup_cached_response(message, mode, selected_text)
+            if cached is not None:
+                return cached
+            if retrieve is not None:
+                context = retrieve(message, selected_text)
+            
+            # Make API request
+            payload = self._build_payload(message, mode, context, selected_text)
+            response = self.session.post(self.api_url, data=json_dumps(payload), headers=self.headers, timeout=self.REQUEST_TIMEOUT)
+            
+            if response.status_code == 200:
+                return self._finish_response(json_loads(response.content), message, mode, key_embedding, cache_namespace)
+            else:
+                logger.error(f"API request failed: {response.status_code} - {response.text}")
+                return self._get_fallback_response(message, mode)
+                
+        except requests.exceptions.Timeout:
+            logger.error("API request timed out")
+            return "I'm experiencing some delays. Let me give you a quick answer: " + self._get_fallback_response(message, mode)
+        except Exception as e:
+            logger.error(f"Error generating response: {str(e)}")
+            return self._get_fallback_response(message, mode)
+    
+    def generate_response_stream(self, message: str, mode: str = "strict",
+                                 context: str = "", selected_text: str = "",
+                                 retrieve: Optional[Callable[[str, str], str]] = None):
+        """Generate AI response incrementally, yielding text chunks as they arrive (`retrieve` as in generate_response)"""
+        if not self.is_ready():
+            yield "Sorry, the AI chat system is currently unavailable. Please try again later."
+            return
+        
+        chunks = []
+        try:
+            cached, key_embedding, cache_namespace = self._lookup_cached_response(message, mode, selected_text)
+            if cached is not None:
+                yield cached
+                return
+            if retrieve is not None:
+                context = retrieve(message, selected_text)
+            
+            payload = self._build_payload(message, mode, context, selected_text)
+            payload["stream"] = True
             
-            # Build user message with context
-            user_message = self._build_user_message(message, context, selected_text)
+            with self.session.post(self.api_url, data=json_dumps(payload), headers=self.headers,
+                                   timeout=self.REQUEST_TIMEOUT, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error(f"API request failed: {response.status_code} - {response.text}")
+                    yield self._get_fallback_response(message, mode)
+                    return
+                
+                # Negative phrases are rewritten before text leaves, so the client sees what
+                # _process_response would produce; the last few characters wait for the next
+                # delta in case a phrase is split across deltas
+                raw = ""
+                sent = 0
+                truncated = False
+                for line in response.iter_lines():
+                    # Server-sent events: "data: {...}" frames, terminated by "data: [DONE]"
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    
+                    choice = json_loads(data)['choices'][0]
+                    if choice.get('finish_reason') == 'length':
+                        truncated = True
+                    delta = choice.get('delta', {}).get('content')
+                    if delta:
+                        raw += delta
+                        text, sent = self._rewrite_negatives(raw, sent, len(raw) - self._NEG_HOLDBACK)
+                        if text:
+                            chunks.append(text)
+                            yield text
+                
+                text, sent = self._rewrite_negatives(raw, sent, len(raw))
+                if text:
+                    chunks.append(text)
+                    yield text
             
-            # Prepare API request
-            payload = {
-                "model": self.model_name,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 512,
-                "top_p": 0.9
-            }
+            # Only the positive ending can still be added after the text has been sent
+            streamed = "".join(chunks)
+            processed_response = self._process_response(raw, mode, message)
+            if processed_response.startswith(streamed) and len(processed_response) > len(streamed):
+                ending = processed_response[len(streamed):]
+                chunks.append(ending)
+                yield ending
+            if self.semantic_cache is not None:
+                # A reply cut off at max_tokens has already been streamed; cache it trimmed to
+                # its last complete sentence so repeats of the question get a clean answer
+                if truncated:
+                    processed_response = self._process_response(self._trim_to_sentence(raw.strip()), mode, message)
+                self.semantic_cache.store(key_embedding, processed_response, cache_namespace)
+                
+        except requests.exceptions.Timeout:
+            logger.error("API request timed out")
+            if not chunks:
+                yield "I'm experiencing some delays. Let me give you a quick answer: " + self._get_fallback_response(message, mode)
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            if not chunks:
+                yield self._get_fallback_response(message, mode)
+    
+    def _rewrite_negatives(self, raw: str, sent: int, cutoff: int) -> Tuple[str, int]:
+        """Rewritten text of raw[sent:cutoff] plus the new sent offset.
+
+        A phrase starting before cutoff is rewritten whole, even past cutoff; one starting at or
+        after it is left for a later call, once enough text has arrived to tell.
+        """
+        parts = []
+        for m in self._NEG_RE.finditer(raw, sent):
+            if m.start() >= cutoff:
+                break
+            parts.append(raw[sent:m.start()])
+            parts.append(self._NEG_SUB[m.group(1)])
+            sent = m.end()
+        if cutoff > sent:
+            parts.append(raw[sent:cutoff])
+            sent = cutoff
+        return "".join(parts), sent
+    
+    async def agenerate_response(self, message: str, mode: str = "strict",
+                                 context: str = "", selected_text: str = "") -> str:
+        """Async counterpart of generate_response for callers running on an event loop"""
+        try:
+            if not self.is_ready():
+                return "Sorry, the AI chat system is currently unavailable. Please try again later."
             
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            # Embedding the question is CPU-bound, keep it off the event loop
+            cached, key_embedding, cache_namespace = await asyncio.to_thread(
+                self._lookup_cached_response, message, mode, selected_text)
+            if cached is not None:
+                return cached
             
-            # Make API request
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=30)
+            payload = self._build_payload(message, mode, context, selected_text)
+            response = await self._apost(payload)
             
             if response.status_code == 200:
-                result = response.json()
-                ai_response = result['choices'][0]['message']['content'].strip()
-                
-                # Post-process response to ensure it's positive and relevant
-                processed_response = self._process_response(ai_response, mode, message)
-                return processed_response
+                return self._finish_response(json_loads(response.content), message, mode, key_embedding, cache_namespace)
             else:
                 logger.error(f"API request failed: {response.status_code} - {response.text}")
                 return self._get_fallback_response(message, mode)
@@ -76,50 +366,108 @@ class ChatModel:
             logger.error(f"Error generating response: {str(e)}")
             return self._get_fallback_response(message, mode)
     
-    def _get_system_prompt(self, mode: str) -> str:
-        """Get system prompt based on chat mode"""
-        base_context = """
-        You are Sai Teja Reddy's AI assistant, representing him on his interactive resume website. 
-        You have access to his complete professional background and personal information.
-        
-        Key facts about Sai:
-        - AI/ML Engineer with 5 years of production experience
-        - Currently pursuing Master's in AI at Oklahoma Christian University
-        - Worked at Ericsson Canada as ML Engineer (2022-2024)
-        - Previously at Cash4You Inc. as Data Scientist (2021-2022)
-        - Passionate about technology, space, mathematics, and helping others
-        - Loves teaching, mentoring, and using technology to better society
-        - Wants to adopt and educate 10 underprivileged children
-        - Enjoys movies, camping, fishing, adventure activities
-        - Expert in Python, TensorFlow, PyTorch, AWS, MLOps, and LLM fine-tuning
+    def _get_async_client(self):
+        """Shared HTTP/2 client for the async methods, created on first use.
+
+        Only the async methods need httpx (install httpx[http2]), so it is imported here
+        rather than at module load. Connections belong to the event loop that opened
+        them, so drive all async calls of one ChatModel from a single long-lived loop.
         """
+        if self._async_client is None:
+            import httpx
+            self._async_client = httpx.AsyncClient(
+                http2=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                timeout=httpx.Timeout(self.REQUEST_TIMEOUT[1], connect=self.REQUEST_TIMEOUT[0])
+            )
+        return self._async_client
+    
+    async def _apost(self, payload: Dict[str, Any]):
+        """POST a completions request on the async client; timeouts raise requests' Timeout like the sync path"""
+        import httpx
+        try:
+            return await self._get_async_client().post(self.api_url, content=json_dumps(payload))
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+    
+    async def aclose(self):
+        """Close the async HTTP client"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
+    def _lookup_cached_response(self, message: str, mode: str, selected_text: str):
+        """Check the semantic cache; returns (cached response, question embedding, namespace)"""
+        # Paraphrases of a recent question (same mode and selection) reuse its answer
+        cache_namespace = f"{mode}\n{selected_text}"
+        if self.semantic_cache is None:
+            return None, None, cache_namespace
+        cached, key_embedding = self.semantic_cache.lookup(message, cache_namespace)
+        return cached, key_embedding, cache_namespace
+    
+    def _build_payload(self, message: str, mode: str, context: str, selected_text: str) -> Dict[str, Any]:
+        """Build the chat completions request body"""
+        # Build system prompt based on mode
+        system_prompt = self._get_system_prompt(mode)
+        
+        # Build user message with context
+        user_message = self._build_user_message(message, context, selected_text)
+        
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            "temperature": 0.7,
+            "max_tokens": self._max_tokens_for(message),
+            "top_p": 0.9
+        }
+    
+    def _max_tokens_for(self, message: str) -> int:
+        """Completion budget scaled to the question; short questions get short answers"""
+        if len(message) < 40:
+            return 128
+        if len(message) < 120:
+            return 256
+        return 512
+    
+    def _trim_to_sentence(self, text: str) -> str:
+        """Cut a reply that hit max_tokens back to its last complete sentence"""
+        end = max(text.rfind('. '), text.rfind('! '), text.rfind('? '), text.rfind('\n'))
+        if text.endswith(('.', '!', '?')):
+            return text
+        if end > 0:
+            return text[:end + 1].rstrip()
+        return text
+    
+    def _log_usage(self, result: Dict[str, Any]):
+        """Log token usage; a stable prompt prefix lets the provider reuse its prefill"""
+        usage = result.get('usage')
+        if usage:
+            logger.debug(f"Token usage: prompt={usage.get('prompt_tokens')} completion={usage.get('completion_tokens')}")
+    
+    def _finish_response(self, result: Dict[str, Any], message: str, mode: str,
+                         key_embedding, cache_namespace: str) -> str:
+        """Extract, post-process and cache the answer from a completions result"""
+        self._log_usage(result)
+        choice = result['choices'][0]
+        ai_response = choice['message']['content'].strip()
+        if choice.get('finish_reason') == 'length':
+            ai_response = self._trim_to_sentence(ai_response)
         
+        # Post-process response to ensure it's positive and relevant
+        processed_response = self._process_response(ai_response, mode, message)
+        if self.semantic_cache is not None:
+            self.semantic_cache.store(key_embedding, processed_response, cache_namespace)
+        return processed_response
+    
+    def _get_system_prompt(self, mode: str) -> str:
+        """Get system prompt based on chat mode"""
         if mode == "strict":
-            return base_context + """
-            
-            STRICT MODE RULES:
-            1. ONLY answer questions related to Sai's resume, career, skills, and professional background
-            2. ALWAYS highlight Sai's strengths and positive aspects
-            3. If asked about weaknesses or negative topics, redirect to related strengths
-            4. Keep responses professional and focused on his qualifications
-            5. If asked about non-resume topics, politely redirect back to his professional profile
-            6. NEVER mention any negative information or limitations
-            7. Always connect answers back to why Sai would be a great hire
-            8. Be enthusiastic and confident about his abilities
-            """
-        else:  # open mode
-            return base_context + """
-            
-            OPEN MODE RULES:
-            1. You can discuss any topic, but always try to relate it back to Sai's interests and skills
-            2. Maintain a positive, helpful tone
-            3. Share Sai's perspectives on technology, AI ethics, education, and social impact
-            4. If discussing non-professional topics, connect them to his personality and values
-            5. Show his curiosity about space, technology, and life's big questions
-            6. Demonstrate his passion for helping others and making a positive impact
-            7. Keep conversations engaging while subtly showcasing his expertise
-            8. Always be authentic to his personality - jovial, helpful, and knowledgeable
-            """
+            return self._SYSTEM_PROMPTS["strict"]
+        return self._SYSTEM_PROMPTS["open"]  # open mode
     
     def _build_user_message(self, message: str, context: str, selected_text: str) -> str:
         """Build user message with context"""
@@ -137,29 +485,13 @@ class ChatModel:
     def _process_response(self, response: str, mode: str, original_question: str) -> str:
         """Post-process AI response to ensure quality"""
         try:
-            # Remove any negative language
-            negative_phrases = ["can't", "cannot", "don't know", "not sure", "weakness", "limitation"]
-            
-            for phrase in negative_phrases:
-                if phrase in response.lower():
-                    # Convert negative to positive
-                    if "weakness" in response.lower():
-                        response = response.replace("weakness", "area for growth that shows my commitment to improvement")
-                    elif "can't" in response.lower() or "cannot" in response.lower():
-                        response = response.replace("can't", "am always learning about")
-                        response = response.replace("cannot", "am continuously developing skills in")
+            # Convert negative language to positive; most responses contain none, so check cheaply first
+            if any(phrase in response for phrase in self._NEGATIVE_TUPLE):
+                response = self._NEG_RE.sub(lambda m: self._NEG_SUB[m.group(1)], response)
             
             # Ensure response ends positively
-            positive_endings = [
-                "I'd be happy to tell you more about this!",
-                "This is one of the areas where I really excel.",
-                "I'm always excited to discuss this topic further!",
-                "Feel free to ask me anything else about my experience.",
-                "This showcases exactly the kind of impact I love to make."
-            ]
-            
-            if not any(ending.lower() in response.lower() for ending in positive_endings):
-                response += f" {positive_endings[0]}"
+            if self._POS_RE.search(response) is None:
+                response += f" {self._POSITIVE_ENDINGS[0]}"
             
             return response
             
@@ -170,67 +502,46 @@ class ChatModel:
     def _get_fallback_response(self, message: str, mode: str) -> str:
         """Get fallback response when API fails"""
         message_lower = message.lower()
-        
-        if any(word in message_lower for word in ["experience", "work", "job", "career"]):
-            return """I have 5+ years of hands-on AI/ML engineering experience, including 2.5 years at Ericsson Canada 
-            where I built production-scale AI systems supporting 100M+ daily events. I specialize in LLM fine-tuning, 
-            RAG systems, and deploying ML models in cloud environments. Would you like to know more about any specific project?"""
-        
-        elif any(word in message_lower for word in ["skills", "technologies", "tools"]):
-            return """I'm proficient in Python, TensorFlow, PyTorch, Hugging Face, AWS, and MLOps tools. I've deployed 
-            models using SageMaker, built CI/CD pipelines, and worked extensively with big data tools like Spark and Kafka. 
-            My recent projects include LLM classification fine-tuning and multilingual speech recognition systems."""
-        
-        elif any(word in message_lower for word in ["education", "degree", "university"]):
-            return """I'm currently pursuing a Master's in Computer Science with AI focus at Oklahoma Christian University. 
-            I also have a PG Diploma in IT Business Analysis from Conestoga College and a B.Tech in Electronics & Communication 
-            from JNTU Hyderabad. I was always a top performer in mathematics and competitive exams."""
-        
-        elif any(word in message_lower for word in ["project", "projects"]):
-            return """I've worked on fascinating projects including LLM fine-tuning for classification, Thai speech recognition 
-            with translation, telecom network diagnostics using AI, and fraud detection systems. Each project demonstrates my 
-            ability to solve real-world problems using cutting-edge AI techniques. Which project interests you most?"""
-        
-        else:
-            return """I'm Sai Teja Reddy's AI assistant! I'm here to tell you about his impressive background as an AI/ML Engineer 
-            with 5 years of production experience. He's passionate about using technology to solve real problems and help others. 
-            What would you like to know about his experience, skills, or projects?"""
+        for keywords, answer in _FALLBACK_TABLE:
+            if keywords.search(message_lower):
+                return answer
+        return _DEFAULT_FALLBACK
     
     def explain_text(self, selected_text: str, section: str) -> str:
         """Explain selected text from the resume"""
+        key = _cache_key(selected_text, section)
+        with self._explain_cache_lock:
+            cached = self._explain_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            explanation_prompt = f"""
-            Explain this text from Sai Teja Reddy's resume in detail: "{selected_text}"
-            Section context: {section}
+            payload = self._build_explain_payload(selected_text, section)
+            response = self.session.post(self.api_url, data=json_dumps(payload), headers=self.headers, timeout=self.REQUEST_TIMEOUT)
             
-            Provide a detailed explanation that:
-            1. Breaks down technical terms for non-technical readers
-            2. Explains the impact and significance
-            3. Shows why this demonstrates Sai's expertise
-            4. Connects to his overall value as a candidate
-            """
-            
-            # Use the same API call structure
-            payload = {
-                "model": self.model_name,
-                "messages": [
-                    {"role": "system", "content": "You are explaining Sai Teja Reddy's resume content. Be detailed, positive, and show his expertise."},
-                    {"role": "user", "content": explanation_prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 400
-            }
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=30)
+            if response.status_code == 200:
+                return self._finish_explanation(json_loads(response.content), key)
+            else:
+                return self._get_text_explanation_fallback(selected_text, section)
+                
+        except Exception as e:
+            logger.error(f"Error explaining text: {str(e)}")
+            return self._get_text_explanation_fallback(selected_text, section)
+    
+    async def aexplain_text(self, selected_text: str, section: str) -> str:
+        """Async counterpart of explain_text"""
+        key = _cache_key(selected_text, section)
+        with self._explain_cache_lock:
+            cached = self._explain_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            payload = self._build_explain_payload(selected_text, section)
+            response = await self._apost(payload)
             
             if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content'].strip()
+                return self._finish_explanation(json_loads(response.content), key)
             else:
                 return self._get_text_explanation_fallback(selected_text, section)
                 
@@ -238,44 +549,54 @@ class ChatModel:
             logger.error(f"Error explaining text: {str(e)}")
             return self._get_text_explanation_fallback(selected_text, section)
     
+    async def explain_batch(self, items: List[Tuple[str, str]]) -> List[str]:
+        """Explain several (selected_text, section) pairs concurrently"""
+        return list(await asyncio.gather(*(self.aexplain_text(text, section) for text, section in items)))
+    
+    def _build_explain_payload(self, selected_text: str, section: str) -> Dict[str, Any]:
+        """Build the request body for a text explanation"""
+        explanation_prompt = f"""
+            Explain this text from Sai Teja Reddy's resume in detail: "{selected_text}"
+            Section context: {section}
+            
+            Provide a detailed explanation that:
+            1. Breaks down technical terms for non-technical readers
+            2. Explains the impact and significance
+            3. Shows why this demonstrates Sai's expertise
+            4. Connects to his overall value as a candidate
+            """
+        
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": "You are explaining Sai Teja Reddy's resume content. Be detailed, positive, and show his expertise."},
+                {"role": "user", "content": explanation_prompt}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 400
+        }
+    
+    def _finish_explanation(self, result: Dict[str, Any], key: bytes) -> str:
+        """Extract the explanation from a completions result and cache it"""
+        self._log_usage(result)
+        explanation = result['choices'][0]['message']['content'].strip()
+        with self._explain_cache_lock:
+            self._explain_cache[key] = explanation
+        return explanation
+    
     def _get_text_explanation_fallback(self, text: str, section: str) -> str:
         """Fallback explanation for selected text"""
-        return f"""This highlights Sai's expertise in {section}. The phrase "{text}" demonstrates his 
-        hands-on experience and technical depth. This kind of experience shows he can deliver real results 
-        and has the practical knowledge that employers value. Would you like me to elaborate on any specific 
-        aspect of this achievement?"""
+        return _EXPLANATION_FALLBACK.format(section=section, text=text)
     
     def get_follow_up_suggestions(self, user_message: str, ai_response: str) -> List[str]:
         """Generate follow-up question suggestions"""
-        message_lower = user_message.lower()
-        
-        if any(word in message_lower for word in ["experience", "work"]):
-            return [
-                "Tell me more about the Ericsson Canada role",
-                "What was his biggest achievement at work?",
-                "How did he improve system performance?"
-            ]
-        elif any(word in message_lower for word in ["skills", "technical"]):
-            return [
-                "What AI/ML frameworks does he use?",
-                "Tell me about his cloud experience",
-                "What's his experience with LLMs?"
-            ]
-        elif any(word in message_lower for word in ["education", "university"]):
-            return [
-                "What's his academic background?",
-                "Tell me about his mathematics skills",
-                "What certifications does he have?"
-            ]
-        elif any(word in message_lower for word in ["projects", "project"]):
-            return [
-                "Show me his recent projects",
-                "What's his most impressive project?",
-                "Tell me about his Kaggle work"
-            ]
-        else:
-            return [
-                "What makes him a great AI engineer?",
-                "Tell me about his leadership experience",
-                "What are his career goals?"
-            ]
\ No newline at end of file
+        # Suggestions only depend on the question, so identical questions share one result
+        return list(_follow_up_suggestions(user_message.lower()))
+
+@lru_cache(maxsize=1024)
+def _follow_up_suggestions(message_lower: str) -> tuple:
+    """Pick follow-up suggestions for a lowercased user message"""
+    for keywords, suggestions in _SUGGESTION_BRANCHES:
+        if keywords.search(message_lower):
+            return suggestions
+    return _DEFAULT_SUGGESTIONS
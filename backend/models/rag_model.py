@@ -1,33 +1,102 @@
 # backend/models/rag_model.py
-import json
 import os
+import hashlib
+import importlib
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
 from typing import List, Dict, Any
 import logging
+import threading
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Query embeddings keyed by normalized text. Shared by retrieval and the chat
+# semantic cache, so a question is embedded once however many paths use it.
+_EMB_CACHE = OrderedDict()
+_EMB_CACHE_LOCK = threading.Lock()
+_EMB_CACHE_SIZE = 512
+
+SECTION_KEYWORDS = {
+    'experience': ['work', 'job', 'position', 'role', 'company', 'responsibilities'],
+    'education': ['degree', 'university', 'college', 'school', 'academic', 'study'],
+    'skills': ['skills', 'technologies', 'programming', 'tools', 'frameworks'],
+    'projects': ['project', 'built', 'developed', 'created', 'implemented'],
+    'certifications': ['certification', 'certified', 'credential', 'license'],
+    'about': ['personal', 'summary', 'profile', 'background', 'interests']
+}
+
 class RAGModel:
-    def __init__(self):
+    # Resume documents are short; one forward pass per 64 keeps memory flat on CPU
+    ENCODE_BATCH_SIZE = 64
+    
+    # Exhaustive search is cheapest for a resume-sized corpus; switch to HNSW graphs past this size
+    HNSW_MIN_DOCUMENTS = 1000
+    HNSW_M = 32
+    HNSW_EF_CONSTRUCTION = 40
+    HNSW_EF_SEARCH = 16
+    
+    # Cached embeddings are only valid for the model that produced them
+    EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+    
+    def __init__(self, cache_dir: str = None):
         """Initialize RAG model with sentence transformer and FAISS"""
-        self.embedding_model = None
         self.index = None
         self.documents = []
         self.embeddings = []
-        self.ready = False
+        self._doc_lower = []
+        self._section_doc_idx = {}
+        self._ready = threading.Event()
         
+        # Optional on-disk embedding cache: one .npz holding a float16 matrix and the document hash of
+        # each row, so the two are always replaced together
+        self.cache_dir = cache_dir
+        self.cache_embeddings_file = os.path.join(cache_dir, 'embeddings.npz') if cache_dir else None
+        
+        # The model and faiss are loaded on first use so constructing the app stays cheap
+        self._embedding_model = None
+        self._embedding_model_failed = False
+        self._faiss = None
+        self._load_lock = threading.Lock()
+        
+        # Warm the model in the background so the first user request doesn't pay for it
+        threading.Thread(target=lambda: self.embedding_model, daemon=True).start()
+    
+    @property
+    def embedding_model(self):
+        """Sentence transformer, loaded on first access (None if it failed to load)"""
+        if self._embedding_model is None and not self._embedding_model_failed:
+            with self._load_lock:
+                if self._embedding_model is None and not self._embedding_model_failed:
+                    self._embedding_model = self._load_embedding_model()
+                    self._embedding_model_failed = self._embedding_model is None
+        return self._embedding_model
+    
+    @property
+    def faiss(self):
+        """faiss module, imported on first access"""
+        if self._faiss is None:
+            self._faiss = importlib.import_module("faiss")
+        return self._faiss
+    
+    def _load_embedding_model(self):
+        """Load the sentence transformer, in half precision when a GPU is available"""
         try:
-            # Load sentence transformer model
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Sentence transformer model loaded successfully")
+            import torch
+            from sentence_transformers import SentenceTransformer
+            
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            model = SentenceTransformer(self.EMBEDDING_MODEL_NAME, device=device)
+            if device == "cuda":
+                model.half()
+            logger.info(f"Sentence transformer model loaded successfully on {device}")
+            return model
         except Exception as e:
             logger.error(f"Failed to load sentence transformer: {str(e)}")
+            return None
     
     def is_ready(self) -> bool:
         """Check if RAG model is ready for use"""
-        return self.ready and self.embedding_model is not None and self.index is not None
+        return self._ready.is_set() and self._embedding_model is not None and self.index is not None
     
     def process_resume_data(self, resume_data: Dict[str, Any]) -> List[str]:
         """Convert resume data into searchable text chunks"""
@@ -37,71 +106,83 @@ class RAGModel:
             # Personal information
             personal = resume_data.get('personal_info', {})
             if personal:
-                doc = f"Personal Information: {personal.get('name', '')} is an {personal.get('title', '')} "
-                doc += f"with {personal.get('summary', '')} "
-                doc += f"Contact: {personal.get('email', '')} | {personal.get('phone', '')} | {personal.get('location', '')}"
-                documents.append(doc)
+                get = personal.get
+                documents.append(
+                    f"Personal Information: {get('name', '')} is an {get('title', '')} "
+                    f"with {get('summary', '')} "
+                    f"Contact: {get('email', '')} | {get('phone', '')} | {get('location', '')}"
+                )
             
             # Professional experience
             experiences = resume_data.get('experience', [])
             for exp in experiences:
-                doc = f"Work Experience: {exp.get('title', '')} at {exp.get('company', '')} "
-                doc += f"from {exp.get('start_date', '')} to {exp.get('end_date', '')}. "
-                doc += f"Location: {exp.get('location', '')}. "
+                get = exp.get
+                parts = [
+                    f"Work Experience: {get('title', '')} at {get('company', '')} "
+                    f"from {get('start_date', '')} to {get('end_date', '')}. "
+                    f"Location: {get('location', '')}. "
+                ]
                 
-                responsibilities = exp.get('responsibilities', [])
+                responsibilities = get('responsibilities', [])
                 if responsibilities:
-                    doc += "Key achievements and responsibilities: " + " ".join(responsibilities)
+                    parts.append("Key achievements and responsibilities: ")
+                    parts.append(" ".join(responsibilities))
                 
-                documents.append(doc)
+                documents.append("".join(parts))
             
             # Education
             education = resume_data.get('education', [])
             for edu in education:
-                doc = f"Education: {edu.get('degree', '')} in {edu.get('field', '')} "
-                doc += f"from {edu.get('institution', '')} "
-                doc += f"({edu.get('start_date', '')} - {edu.get('end_date', '')}). "
-                doc += f"Location: {edu.get('location', '')}. "
-                if edu.get('gpa'):
-                    doc += f"GPA: {edu.get('gpa')}. "
-                if edu.get('achievements'):
-                    doc += f"Achievements: {' '.join(edu.get('achievements', []))}"
-                documents.append(doc)
+                get = edu.get
+                parts = [
+                    f"Education: {get('degree', '')} in {get('field', '')} "
+                    f"from {get('institution', '')} "
+                    f"({get('start_date', '')} - {get('end_date', '')}). "
+                    f"Location: {get('location', '')}. "
+                ]
+                if get('gpa'):
+                    parts.append(f"GPA: {get('gpa')}. ")
+                if get('achievements'):
+                    parts.append(f"Achievements: {' '.join(get('achievements', []))}")
+                documents.append("".join(parts))
             
             # Skills
             skills = resume_data.get('skills', {})
-            for category, skill_list in skills.items():
-                if skill_list:
-                    doc = f"Skills in {category}: {', '.join(skill_list)}"
-                    documents.append(doc)
+            documents.extend(
+                f"Skills in {category}: {', '.join(skill_list)}"
+                for category, skill_list in skills.items() if skill_list
+            )
             
             # Projects
             projects = resume_data.get('projects', [])
             for project in projects:
-                doc = f"Project: {project.get('title', '')}. "
-                doc += f"Description: {project.get('description', '')} "
-                technologies = project.get('technologies', [])
+                get = project.get
+                parts = [
+                    f"Project: {get('title', '')}. "
+                    f"Description: {get('description', '')} "
+                ]
+                technologies = get('technologies', [])
                 if technologies:
-                    doc += f"Technologies used: {', '.join(technologies)}. "
-                if project.get('achievements'):
-                    doc += f"Key achievements: {' '.join(project.get('achievements', []))}"
-                documents.append(doc)
+                    parts.append(f"Technologies used: {', '.join(technologies)}. ")
+                if get('achievements'):
+                    parts.append(f"Key achievements: {' '.join(get('achievements', []))}")
+                documents.append("".join(parts))
             
             # Certifications
             certifications = resume_data.get('certifications', [])
             for cert in certifications:
-                doc = f"Certification: {cert.get('name', '')} "
-                if cert.get('issuer'):
-                    doc += f"issued by {cert.get('issuer')} "
-                if cert.get('date'):
-                    doc += f"on {cert.get('date')}"
-                documents.append(doc)
+                get = cert.get
+                parts = [f"Certification: {get('name', '')} "]
+                if get('issuer'):
+                    parts.append(f"issued by {get('issuer')} ")
+                if get('date'):
+                    parts.append(f"on {get('date')}")
+                documents.append("".join(parts))
             
             # Core competencies and achievements
             competencies = resume_data.get('core_competencies', [])
             if competencies:
-                doc = f"Core Competencies: {' '.join(competencies)}"
-                documents.append(doc)
+                documents.append(f"Core Competencies: {' '.join(competencies)}")
             
             logger.info(f"Processed resume data into {len(documents)} text chunks")
             return documents
@@ -122,33 +203,145 @@ class RAGModel:
             if not self.documents:
                 raise Exception("No documents generated from resume data")
             
-            # Generate embeddings
-            self.embeddings = self.embedding_model.encode(self.documents)
+            # Match section keywords once per resume version rather than per request
+            self._doc_lower = [doc.lower() for doc in self.documents]
+            self._section_doc_idx = {
+                section: [i for i, doc in enumerate(self._doc_lower) if any(k in doc for k in keywords)]
+                for section, keywords in SECTION_KEYWORDS.items()
+            }
             
-            # Create FAISS index
-            dimension = self.embeddings.shape[1]
-            self.index = faiss.IndexFlatIP(dimension)  # Inner product for similarity
+            # Only documents that changed since the last run are encoded
+            self.embeddings = self._get_embeddings(self.documents)
             
-            # Normalize embeddings for cosine similarity
-            faiss.normalize_L2(self.embeddings)
-            self.index.add(self.embeddings.astype('float32'))
+            # Create FAISS index
+            self.index = self._build_index(np.ascontiguousarray(self.embeddings, dtype=np.float32))
             
-            self.ready = True
+            self._ready.set()
             logger.info(f"FAISS index initialized with {len(self.documents)} documents")
             
         except Exception as e:
             logger.error(f"Failed to initialize embeddings: {str(e)}")
-            self.ready = False
+            self._ready.clear()
+    
+    def _build_index(self, embeddings: np.ndarray):
+        """Build an inner-product index over unit-length embeddings"""
+        faiss = self.faiss
+        dimension = embeddings.shape[1]
+        if len(embeddings) < self.HNSW_MIN_DOCUMENTS:
+            # Exhaustive inner-product search over 8-bit codes; unit vectors quantize with little loss
+            index = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+        else:
+            index = faiss.IndexHNSWFlat(dimension, self.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = self.HNSW_EF_SEARCH
+        index.add(embeddings)
+        return index
+    
+    def _document_hash(self, document: str) -> str:
+        """Cache key for a document's embedding"""
+        return hashlib.blake2b(f"{self.EMBEDDING_MODEL_NAME}\n{document}".encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _get_embeddings(self, documents: List[str]) -> np.ndarray:
+        """Embeddings for documents, encoding only those missing from the on-disk cache"""
+        hashes = [self._document_hash(doc) for doc in documents]
+        cached_hashes, cached = self._load_cached_embeddings()
+        
+        if cached_hashes == hashes:
+            logger.info(f"Loaded {len(documents)} cached embeddings from {self.cache_embeddings_file}")
+            return cached
+        
+        rows = {h: i for i, h in enumerate(cached_hashes)}
+        misses = [i for i, h in enumerate(hashes) if h not in rows]
+        
+        embeddings = np.empty((len(documents), self.embedding_model.get_sentence_embedding_dimension()), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            if h in rows:
+                embeddings[i] = cached[rows[h]]
+        if misses:
+            embeddings[misses] = self._encode([documents[i] for i in misses])
+        
+        logger.info(f"Encoded {len(misses)} of {len(documents)} documents ({len(documents) - len(misses)} cached)")
+        self._save_cached_embeddings(hashes, embeddings)
+        return embeddings
+    
+    def _load_cached_embeddings(self):
+        """Return (row hashes, float16 matrix) from the cache, or ([], None)"""
+        if not self.cache_dir:
+            return [], None
+        
+        try:
+            with np.load(self.cache_embeddings_file, allow_pickle=False) as cache:
+                hashes = cache['hashes'].tolist()
+                embeddings = cache['embeddings']
+            if len(embeddings) != len(hashes):
+                raise ValueError("embedding rows do not match the cache index")
+            return hashes, embeddings
+        except FileNotFoundError:
+            return [], None
+        except Exception as e:
+            logger.warning(f"Ignoring cached embeddings: {str(e)}")
+            return [], None
+    
+    def _save_cached_embeddings(self, hashes: List[str], embeddings: np.ndarray):
+        """Atomically replace the cache with the current documents' embeddings"""
+        if not self.cache_dir:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            
+            # Hashes and matrix share one file, swapped in whole, so a crash can't pair one with the other's old version
+            tmp_path = f"{self.cache_embeddings_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, hashes=np.array(hashes, dtype=str), embeddings=embeddings.astype(np.float16))
+            os.replace(tmp_path, self.cache_embeddings_file)
+        except Exception as e:
+            logger.warning(f"Failed to store embeddings: {str(e)}")
     
     def refresh_embeddings(self, resume_data: Dict[str, Any]):
         """Refresh embeddings with updated resume data"""
         try:
-            self.ready = False
+            self._ready.clear()
             self.initialize_embeddings(resume_data)
             logger.info("Embeddings refreshed successfully")
         except Exception as e:
             logger.error(f"Failed to refresh embeddings: {str(e)}")
     
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches as unit-length float32 rows"""
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=self.ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        # Already float32 on CPU, so this only copies for a half-precision GPU model
+        embeddings = embeddings.astype(np.float32, copy=False)
+        assert embeddings.dtype == np.float32 and embeddings.flags['C_CONTIGUOUS']
+        return embeddings
+    
+    def encode_query(self, text: str):
+        """Embed a single text as a unit-length float32 vector (None if no model is loaded)"""
+        if self._embedding_model is None:
+            return None  # Not loaded yet; callers fall back rather than block on the load
+        
+        # The MiniLM tokenizer is uncased, so case and surrounding whitespace don't change the vector
+        key = text.strip().lower()
+        with _EMB_CACHE_LOCK:
+            embedding = _EMB_CACHE.get(key)
+            if embedding is not None:
+                _EMB_CACHE.move_to_end(key)
+                return embedding
+        
+        embedding = self._encode([key])[0]
+        with _EMB_CACHE_LOCK:
+            _EMB_CACHE[key] = embedding
+            if len(_EMB_CACHE) > _EMB_CACHE_SIZE:
+                _EMB_CACHE.popitem(last=False)
+        return embedding
+    
     def get_relevant_context(self, query: str, additional_context: str = "") -> str:
         """Retrieve relevant context for a given query"""
         try:
@@ -160,13 +353,12 @@ class RAGModel:
             if additional_context:
                 search_query = f"{additional_context} {query}"
             
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode([search_query])
-            faiss.normalize_L2(query_embedding)
+            # Generate query embedding (cached for repeated questions)
+            query_embedding = self.encode_query(search_query)[np.newaxis]
             
             # Search for similar documents
             k = min(3, len(self.documents))  # Get top 3 relevant documents
-            scores, indices = self.index.search(query_embedding.astype('float32'), k)
+            scores, indices = self.index.search(query_embedding, k)
             
             # Combine relevant documents
             relevant_docs = []
@@ -198,28 +390,16 @@ class RAGModel:
     def get_section_context(self, section: str) -> str:
         """Get specific context for a resume section"""
         try:
-            section_keywords = {
-                'experience': ['work', 'job', 'position', 'role', 'company', 'responsibilities'],
-                'education': ['degree', 'university', 'college', 'school', 'academic', 'study'],
-                'skills': ['skills', 'technologies', 'programming', 'tools', 'frameworks'],
-                'projects': ['project', 'built', 'developed', 'created', 'implemented'],
-                'certifications': ['certification', 'certified', 'credential', 'license'],
-                'about': ['personal', 'summary', 'profile', 'background', 'interests']
-            }
-            
             if not self.is_ready():
                 return f"Information about {section} section."
             
-            keywords = section_keywords.get(section.lower(), [section])
-            
-            # Find documents related to the section
-            relevant_docs = []
-            for doc in self.documents:
-                doc_lower = doc.lower()
-                if any(keyword in doc_lower for keyword in keywords):
-                    relevant_docs.append(doc)
+            indices = self._section_doc_idx.get(section.lower())
+            if indices is None:
+                # Unknown sections are matched by name
+                indices = [i for i, doc in enumerate(self._doc_lower) if section in doc]
             
-            return " ".join(relevant_docs[:3]) if relevant_docs else f"No specific information found for {section}."
+            relevant_docs = [self.documents[i] for i in indices[:3]]
+            return " ".join(relevant_docs) if relevant_docs else f"No specific information found for {section}."
             
         except Exception as e:
             logger.error(f"Error getting section context: {str(e)}")
@@ -231,11 +411,10 @@ class RAGModel:
             if not self.is_ready():
                 return []
             
-            query_embedding = self.embedding_model.encode([query])
-            faiss.normalize_L2(query_embedding)
+            query_embedding = self.encode_query(query)[np.newaxis]
             
             k = min(limit, len(self.documents))
-            scores, indices = self.index.search(query_embedding.astype('float32'), k)
+            scores, indices = self.index.search(query_embedding, k)
             
             results = []
             for i, score in zip(indices[0], scores[0]):
@@ -0,0 +1,81 @@
+# backend/models/semantic_cache.py
+import numpy as np
+import threading
+from typing import Callable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    def __init__(self, encoder: Callable[[str], Optional[np.ndarray]],
+                 threshold: float = 0.87, max_size: int = 256):
+        """Cache responses by prompt meaning rather than exact text.
+
+        `encoder` maps text to a unit-length float32 vector, or None when no
+        embedding model is available (the cache is then bypassed).
+        """
+        self.encoder = encoder
+        self.threshold = threshold
+        self.max_size = max_size
+
+        self._matrix = None  # (max_size, dim) float32, filled row by row
+        self._namespaces = []
+        self._responses = []
+        self._last_used = []
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, text: str, namespace: str = "") -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """Return (cached response or None, embedding of text to pass to store())"""
+        embedding = self.encoder(text)
+        if embedding is None:
+            return None, None
+
+        with self._lock:
+            if not self._responses:
+                return None, embedding
+
+            sims = self._matrix[:len(self._responses)] @ embedding
+            for i, ns in enumerate(self._namespaces):
+                if ns != namespace:
+                    sims[i] = -1.0
+
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None, embedding
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            logger.info(f"Semantic cache hit (similarity {sims[best]:.3f})")
+            return self._responses[best], embedding
+
+    def store(self, embedding: Optional[np.ndarray], response: str, namespace: str = ""):
+        """Remember a response, evicting the least recently used entry when full"""
+        if embedding is None:
+            return
+
+        with self._lock:
+            self._clock += 1
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_size, embedding.shape[0]), dtype=np.float32)
+
+            if len(self._responses) < self.max_size:
+                row = len(self._responses)
+                self._namespaces.append(namespace)
+                self._responses.append(response)
+                self._last_used.append(self._clock)
+            else:
+                row = int(np.argmin(self._last_used))
+                self._namespaces[row] = namespace
+                self._responses[row] = response
+                self._last_used[row] = self._clock
+
+            self._matrix[row] = embedding
+    
+    def clear(self):
+        """Forget every cached response (e.g. after the resume data changes)"""
+        with self._lock:
+            self._matrix = None
+            self._namespaces = []
+            self._responses = []
+            self._last_used = []
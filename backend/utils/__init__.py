@@ -7,5 +7,7 @@ Contains analytics, PDF generation, and text processing utilities.
 from .analytics import AnalyticsTracker
 from .pdf_generator import PDFGenerator
 from .text_processing import TextProcessor
+from .json_utils import json_loads, json_dumps, load_json_mmap, append_jsonl, extend_jsonl, read_jsonl
 
-__all__ = ['AnalyticsTracker', 'PDFGenerator', 'TextProcessor']
\ No newline at end of file
+__all__ = ['AnalyticsTracker', 'PDFGenerator', 'TextProcessor', 'json_loads', 'json_dumps', 'load_json_mmap',
+           'append_jsonl', 'extend_jsonl', 'read_jsonl']
\ No newline at end of file
@@ -1,80 +1,128 @@
 # backend/utils/analytics.py
-import json
 import os
-from datetime import datetime
-from collections import defaultdict
+import atexit
+import fcntl
+import threading
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from collections import Counter, deque
 import logging
+import numpy as np
+from .json_utils import json_dumps, extend_jsonl, load_json_mmap, read_jsonl
 
 logger = logging.getLogger(__name__)
 
 class AnalyticsTracker:
-    def __init__(self):
-        self.analytics_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'analytics.json')
+    # Raw events kept on disk; the aggregate counters cover all history
+    MAX_VISITS = 1000
+    MAX_CHATS = 500
+    
+    # Pending events are written every FLUSH_INTERVAL seconds, or sooner once batch_size are queued;
+    # past MAX_PENDING_EVENTS (disk stalled) the oldest pending events are dropped
+    FLUSH_INTERVAL = 0.5
+    MAX_PENDING_EVENTS = 10000
+    
+    def __init__(self, batch_size=128):
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.analytics_file = os.path.join(data_dir, 'aggregate.json')
+        self.legacy_analytics_file = os.path.join(data_dir, 'analytics.json')
+        self.visits_file = os.path.join(data_dir, 'visits.jsonl')
+        self.chats_file = os.path.join(data_dir, 'chats.jsonl')
+        self.batch_size = batch_size
         self.ensure_analytics_file()
+        
+        # Request handlers only enqueue events; a single writer thread applies them in batches
+        self._start_writer()
+        atexit.register(self.flush)
+        
+        # Threads do not survive fork (e.g. gunicorn preload_app), so each worker starts its own writer
+        os.register_at_fork(after_in_child=self._start_writer)
+    
+    def _start_writer(self):
+        """Create the event queue and start the background writer for this process"""
+        self._queue = deque(maxlen=self.MAX_PENDING_EVENTS)
+        self._wakeup = threading.Event()
+        self._write_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._writer_loop, name='analytics-writer', daemon=True)
+        self._writer.start()
     
     def ensure_analytics_file(self):
-        """Ensure analytics file exists with default structure"""
-        if not os.path.exists(self.analytics_file):
-            default_analytics = {
-                'visits': [],
-                'chat_interactions': [],
-                'page_views': {},
-                'popular_sections': {},
-                'user_agents': {},
-                'countries': {},
-                'total_visits': 0,
-                'total_chats': 0
-            }
-            self.save_analytics(default_analytics)
+        """Ensure the aggregate file exists, migrating a legacy analytics.json if present"""
+        if os.path.exists(self.analytics_file):
+            return
+        
+        if os.path.exists(self.legacy_analytics_file):
+            self._migrate_legacy_analytics()
+        else:
+            self.save_analytics(self._default_aggregate())
+    
+    def _default_aggregate(self):
+        """Empty aggregate counters"""
+        return {
+            'total_visits': 0,
+            'total_chats': 0,
+            'user_agents': {},
+            'chat_modes': {}
+        }
+    
+    def _migrate_legacy_analytics(self):
+        """Split the old single-file analytics into event logs plus aggregate counters"""
+        try:
+            legacy = load_json_mmap(self.legacy_analytics_file)
+            
+            visits = legacy.get('visits', [])
+            chats = legacy.get('chat_interactions', [])
+            extend_jsonl(self.visits_file, visits, max_lines=self.MAX_VISITS)
+            extend_jsonl(self.chats_file, chats, max_lines=self.MAX_CHATS)
+            
+            aggregate = self._default_aggregate()
+            aggregate['total_visits'] = legacy.get('total_visits', len(visits))
+            aggregate['total_chats'] = legacy.get('total_chats', len(chats))
+            aggregate['user_agents'] = legacy.get('user_agents', {})
+            aggregate['chat_modes'] = dict(Counter(c.get('mode', 'unknown') for c in chats))
+            self.save_analytics(aggregate)
+            
+            os.replace(self.legacy_analytics_file, f"{self.legacy_analytics_file}.migrated")
+            logger.info(f"Migrated {len(visits)} visits and {len(chats)} chats from {self.legacy_analytics_file}")
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy analytics: {str(e)}")
+            self.save_analytics(self._default_aggregate())
     
     def load_analytics(self):
-        """Load analytics data from file"""
+        """Load the aggregate counters from file"""
         try:
-            with open(self.analytics_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            return load_json_mmap(self.analytics_file)
+        except (FileNotFoundError, ValueError):
             logger.error("Failed to load analytics data")
             return {}
     
     def save_analytics(self, data):
-        """Save analytics data to file"""
+        """Save the aggregate counters to file"""
         try:
             os.makedirs(os.path.dirname(self.analytics_file), exist_ok=True)
-            with open(self.analytics_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            
+            # Write a complete snapshot beside the file, then swap it in atomically
+            tmp_path = f"{self.analytics_file}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(json_dumps(data) + b'\n')
+            os.replace(tmp_path, self.analytics_file)
             return True
         except Exception as e:
             logger.error(f"Failed to save analytics: {str(e)}")
             return False
     
     def track_visit(self, visitor_info):
-        """Track a page visit"""
-        analytics = self.load_analytics()
-        
+        """Queue a page visit for the background writer"""
         visit_data = {
             'timestamp': datetime.now().isoformat(),
             'ip': visitor_info.get('ip', 'unknown'),
-            'user_agent': visitor_info.get('user_agent', 'unknown'),
+            'user_agent': visitor_info.get('user_agent') or 'unknown',
             'page': visitor_info.get('page', 'main')
         }
-        
-        analytics['visits'].append(visit_data)
-        analytics['total_visits'] = analytics.get('total_visits', 0) + 1
-        
-        # Update user agents stats
-        ua = visitor_info.get('user_agent', 'unknown')[:50]  # Truncate for privacy
-        analytics['user_agents'][ua] = analytics['user_agents'].get(ua, 0) + 1
-        
-        # Keep only last 1000 visits to manage file size
-        analytics['visits'] = analytics['visits'][-1000:]
-        
-        self.save_analytics(analytics)
-        logger.info(f"Tracked visit from {visitor_info.get('ip', 'unknown')}")
+        self._enqueue(('visit', visit_data))
     
     def track_chat_interaction(self, session_id, message, mode):
-        """Track a chat interaction"""
-        analytics = self.load_analytics()
-        
+        """Queue a chat interaction for the background writer"""
         chat_data = {
             'timestamp': datetime.now().isoformat(),
             'session_id': session_id,
@@ -82,68 +130,138 @@ class AnalyticsTracker:
             'mode': mode,
             'message_preview': message[:50]  # First 50 chars for analysis
         }
+        self._enqueue(('chat', chat_data))
+    
+    def _enqueue(self, event):
+        """Hand an event to the writer, waking it early once a full batch is pending"""
+        self._queue.append(event)
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+    
+    def _drain(self):
+        """Take every pending event off the queue"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.popleft())
+            except IndexError:
+                return batch
+    
+    def flush(self):
+        """Write any queued events synchronously (used at shutdown)"""
+        batch = self._drain()
+        if batch:
+            self._write_batch(batch)
+    
+    def _writer_loop(self):
+        """Periodically drain the queue and write everything pending as one batch"""
+        while True:
+            self._wakeup.wait(self.FLUSH_INTERVAL)
+            self._wakeup.clear()
+            
+            batch = self._drain()
+            if not batch:
+                continue
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(f"Failed to write analytics batch: {str(e)}")
+    
+    def _write_batch(self, batch):
+        """Append a batch of events to the logs and fold it into the aggregate counters"""
+        visits = [data for kind, data in batch if kind == 'visit']
+        chats = [data for kind, data in batch if kind == 'chat']
+        
+        with self._write_lock:
+            extend_jsonl(self.visits_file, visits, max_lines=self.MAX_VISITS)
+            extend_jsonl(self.chats_file, chats, max_lines=self.MAX_CHATS)
+            
+            # The aggregate is a few counters, so re-reading it under a cross-process lock
+            # keeps gunicorn workers' totals additive
+            with open(f"{self.analytics_file}.lock", 'ab') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._update_aggregate(visits, chats)
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            logger.info(f"Wrote {len(batch)} analytics events")
+    
+    def _update_aggregate(self, visits, chats):
+        """Fold a batch's counts into the aggregate file (caller holds the aggregate lock)"""
+        aggregate = self.load_analytics() or self._default_aggregate()
+        aggregate['total_visits'] = aggregate.get('total_visits', 0) + len(visits)
+        aggregate['total_chats'] = aggregate.get('total_chats', 0) + len(chats)
         
-        analytics['chat_interactions'].append(chat_data)
-        analytics['total_chats'] = analytics.get('total_chats', 0) + 1
+        # Update user agents stats
+        user_agents = aggregate.setdefault('user_agents', {})
+        for visit in visits:
+            ua = visit['user_agent'][:50]  # Truncate for privacy
+            user_agents[ua] = user_agents.get(ua, 0) + 1
         
-        # Keep only last 500 chat interactions
-        analytics['chat_interactions'] = analytics['chat_interactions'][-500:]
+        chat_modes = aggregate.setdefault('chat_modes', {})
+        for chat in chats:
+            mode = chat.get('mode', 'unknown')
+            chat_modes[mode] = chat_modes.get(mode, 0) + 1
         
-        self.save_analytics(analytics)
-        logger.info(f"Tracked chat interaction in {mode} mode")
+        self.save_analytics(aggregate)
     
     def get_analytics_summary(self):
         """Get comprehensive analytics summary"""
         analytics = self.load_analytics()
         
+        visits = read_jsonl(self.visits_file, limit=self.MAX_VISITS)
+        chats = read_jsonl(self.chats_file, limit=self.MAX_CHATS)
+        
+        # Only the timestamps are scanned, so pull them out as one column per log. Workers flush
+        # buffered batches independently, so the logs are only roughly in time order; sort the
+        # timestamps (nearly sorted, so cheap) before searching them
+        visit_times = sorted([v['timestamp'] for v in visits])
+        chat_times = sorted([c['timestamp'] for c in chats])
+        
         # Calculate summary stats
         total_visits = analytics.get('total_visits', 0)
         total_chats = analytics.get('total_chats', 0)
         
         # Recent activity (last 30 days)
-        thirty_days_ago = (datetime.now().replace(microsecond=0) - 
-                          datetime.timedelta(days=30)).isoformat()
+        now = datetime.now()
+        thirty_days_ago = (now.replace(microsecond=0) - timedelta(days=30)).isoformat()
         
-        recent_visits = [v for v in analytics.get('visits', []) 
-                        if v['timestamp'] >= thirty_days_ago]
-        recent_chats = [c for c in analytics.get('chat_interactions', []) 
-                       if c['timestamp'] >= thirty_days_ago]
+        # With the timestamps sorted, the recent ones are a suffix found by bisection
+        recent_visits_start = bisect_left(visit_times, thirty_days_ago)
+        recent_chats_start = bisect_left(chat_times, thirty_days_ago)
         
         # Top user agents
         user_agents = analytics.get('user_agents', {})
         top_browsers = sorted(user_agents.items(), key=lambda x: x[1], reverse=True)[:5]
         
         # Chat mode analysis
-        chat_modes = defaultdict(int)
-        for chat in analytics.get('chat_interactions', []):
-            chat_modes[chat.get('mode', 'unknown')] += 1
+        chat_modes = analytics.get('chat_modes', {})
         
-        # Daily activity for the last 7 days
+        # Daily activity for the last 7 days: the timestamps are sorted ISO strings, so binary searching
+        # for each day boundary (oldest day through tomorrow) gives every day's count as a difference
+        days = [(now - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(-1, 7)][::-1]
+        visits_per_day = np.diff(np.searchsorted(np.array(visit_times, dtype=str), days))
+        chats_per_day = np.diff(np.searchsorted(np.array(chat_times, dtype=str), days))
         daily_activity = {}
-        for i in range(7):
-            date = (datetime.now() - datetime.timedelta(days=i)).strftime('%Y-%m-%d')
-            daily_visits = len([v for v in recent_visits 
-                              if v['timestamp'].startswith(date)])
-            daily_chats = len([c for c in recent_chats 
-                             if c['timestamp'].startswith(date)])
-            daily_activity[date] = {
-                'visits': daily_visits,
-                'chats': daily_chats
+        for i in reversed(range(7)):
+            daily_activity[days[i]] = {
+                'visits': int(visits_per_day[i]),
+                'chats': int(chats_per_day[i])
             }
         
         return {
             'overview': {
                 'total_visits': total_visits,
                 'total_chats': total_chats,
-                'recent_visits_30d': len(recent_visits),
-                'recent_chats_30d': len(recent_chats),
+                'recent_visits_30d': len(visit_times) - recent_visits_start,
+                'recent_chats_30d': len(chat_times) - recent_chats_start,
                 'conversion_rate': round((total_chats / max(total_visits, 1)) * 100, 2)
             },
             'daily_activity': daily_activity,
             'top_browsers': dict(top_browsers),
             'chat_modes': dict(chat_modes),
             'recent_activity': {
-                'last_visit': analytics.get('visits', [])[-1] if analytics.get('visits') else None,
-                'last_chat': analytics.get('chat_interactions', [])[-1] if analytics.get('chat_interactions') else None
+                'last_visit': max(visits, key=lambda v: v['timestamp']) if visits else None,
+                'last_chat': max(chats, key=lambda c: c['timestamp']) if chats else None
             }
-        }
\ No newline at end of file
+        }
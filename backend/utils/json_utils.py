@@ -0,0 +1,131 @@
+# backend/utils/json_utils.py
+import fcntl
+import json
+import mmap
+import os
+import threading
+from collections import deque
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+if orjson is not None:
+    _PRETTY_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    _COMPACT_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def json_loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(data, pretty=False, sort_keys=False) -> bytes:
+    """Serialize data to UTF-8 encoded JSON bytes"""
+    if orjson is not None:
+        option = _PRETTY_OPTIONS if pretty else _COMPACT_OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys).encode('utf-8')
+
+def load_json_mmap(filepath):
+    """Parse a JSON file through a read-only memory map instead of reading it into a string"""
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{filepath} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+# Serializes JSONL appends/rotations within a process; an flock on a sidecar .lock file
+# serializes them across processes (e.g. gunicorn workers sharing the data directory).
+# Line counts are tracked per path as (inode, size, count) so other writers' appends are
+# counted from the bytes they added, and a rotation elsewhere (new inode) forces a recount.
+_JSONL_LOCK = threading.Lock()
+_JSONL_LINE_COUNTS = {}
+
+def append_jsonl(filepath, record, max_lines=None):
+    """Append a record as a single JSON line.
+
+    When max_lines is given the file is trimmed back to its newest max_lines
+    records once it grows past twice that, keeping appends O(1) amortized.
+    """
+    extend_jsonl(filepath, (record,), max_lines=max_lines)
+
+def extend_jsonl(filepath, records, max_lines=None):
+    """Append several records with one write; trimming works as in append_jsonl"""
+    lines = [json_dumps(record) + b'\n' for record in records]
+    if not lines:
+        return
+    
+    with _JSONL_LOCK, open(f"{filepath}.lock", 'ab') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            with open(filepath, 'ab') as f:
+                f.writelines(lines)
+                f.flush()
+                stat = os.fstat(f.fileno())
+            
+            if max_lines is None:
+                return
+            
+            count = _count_jsonl_lines(filepath, stat)
+            if count > 2 * max_lines:
+                with open(filepath, 'rb') as f:
+                    tail = deque(f, maxlen=max_lines)
+                tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.writelines(tail)
+                os.replace(tmp_path, filepath)
+                stat = os.stat(filepath)
+                count = len(tail)
+            
+            _JSONL_LINE_COUNTS[filepath] = (stat.st_ino, stat.st_size, count)
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def _count_jsonl_lines(filepath, stat):
+    """Line count of a JSONL file, reading only what was appended since it was last counted"""
+    known = _JSONL_LINE_COUNTS.get(filepath)
+    with open(filepath, 'rb') as f:
+        if known is not None and known[0] == stat.st_ino and known[1] <= stat.st_size:
+            f.seek(known[1])
+            return known[2] + f.read(stat.st_size - known[1]).count(b'\n')
+        return sum(1 for _ in f)
+
+def read_jsonl(filepath, limit=None):
+    """Read the newest `limit` records from a JSONL file, skipping malformed lines"""
+    try:
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or limit == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Walk back over `limit` line breaks so only the tail is copied out of the page cache
+                start = 0
+                if limit is not None:
+                    pos = size - 1 if mm[size - 1] == 0x0A else size
+                    for _ in range(limit):
+                        pos = mm.rfind(b'\n', 0, pos)
+                        if pos == -1:
+                            break
+                    start = pos + 1
+                lines = mm[start:size].splitlines()
+    except FileNotFoundError:
+        return []
+    
+    records = []
+    for line in lines:
+        if not line:
+            continue
+        try:
+            records.append(json_loads(line))
+        except ValueError:
+            continue
+    return records
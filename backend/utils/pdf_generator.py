@@ -1,4 +1,5 @@
 # backend/utils/pdf_generator.py
+import io
 import os
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -8,32 +9,52 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.platypus import PageBreak, KeepTogether
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from datetime import datetime
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=64)
+def _category_label(category):
+    """Display label for a skills category key, e.g. 'cloud_platforms' -> 'Cloud Platforms'"""
+    return category.replace('_', ' ').title()
+
 class PDFGenerator:
+    # Part of the generated-PDF cache key and ETag; bump whenever the layout or styles change
+    LAYOUT_VERSION = 2
+    
     def __init__(self):
         self.primary_color = HexColor('#667eea')
         self.secondary_color = HexColor('#764ba2')
         self.text_color = HexColor('#1e293b')
         self.light_gray = HexColor('#f8fafc')
         
-    def generate_resume_pdf(self, resume_data):
-        """Generate a professional PDF resume from resume data"""
+        # Styles are immutable, so build them once and share them across every PDF
+        self._styles = self._create_styles()
+    
+    def generate_resume_pdf(self, resume_data, filepath=None, as_bytes=False):
+        """Generate a professional PDF resume from resume data.
+
+        Returns the file path, or the PDF bytes (built in memory, nothing written) when as_bytes is set.
+        """
         try:
-            # Create output directory
-            output_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'frontend', 'resumes', 'generated')
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'sai_teja_reddy_resume_{timestamp}.pdf'
-            filepath = os.path.join(output_dir, filename)
+            if as_bytes:
+                target = io.BytesIO()
+            else:
+                if filepath is None:
+                    # Create output directory
+                    output_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'frontend', 'resumes', 'generated')
+                    os.makedirs(output_dir, exist_ok=True)
+                    
+                    # Generate filename with timestamp
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    filename = f'sai_teja_reddy_resume_{timestamp}.pdf'
+                    filepath = os.path.join(output_dir, filename)
+                target = filepath
             
             # Create PDF document
             doc = SimpleDocTemplate(
-                filepath,
+                target,
                 pagesize=letter,
                 rightMargin=0.75*inch,
                 leftMargin=0.75*inch,
@@ -43,7 +64,7 @@ class PDFGenerator:
             
             # Build content
             story = []
-            styles = self._create_styles()
+            styles = self._styles
             
             # Add header
             self._add_header(story, resume_data, styles)
@@ -77,8 +98,13 @@ class PDFGenerator:
             
             # Build PDF
             doc.build(story)
-            logger.info(f"Generated PDF resume: {filepath}")
             
+            if as_bytes:
+                pdf_bytes = target.getvalue()
+                logger.info(f"Generated PDF resume in memory ({len(pdf_bytes)} bytes)")
+                return pdf_bytes
+            
+            logger.info(f"Generated PDF resume: {filepath}")
             return filepath
             
         except Exception as e:
@@ -87,93 +113,90 @@ class PDFGenerator:
     
     def _create_styles(self):
         """Create custom styles for the PDF"""
-        styles = getSampleStyleSheet()
-        
-        # Header styles
-        styles.add(ParagraphStyle(
-            name='Name',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=self.primary_color,
-            fontName='Helvetica-Bold',
-            alignment=TA_CENTER,
-            spaceAfter=6
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='Title',
-            parent=styles['Normal'],
-            fontSize=14,
-            textColor=self.secondary_color,
-            fontName='Helvetica',
-            alignment=TA_CENTER,
-            spaceAfter=12
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='Contact',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=self.text_color,
-            fontName='Helvetica',
-            alignment=TA_CENTER,
-            spaceAfter=12
-        ))
+        base = getSampleStyleSheet()
         
-        # Section styles
-        styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=self.primary_color,
-            fontName='Helvetica-Bold',
-            spaceBefore=12,
-            spaceAfter=8,
-            borderWidth=0,
-            borderColor=self.primary_color,
-            borderPadding=4
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='JobTitle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=self.text_color,
-            fontName='Helvetica-Bold',
-            spaceBefore=8,
-            spaceAfter=2
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='Company',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=self.primary_color,
-            fontName='Helvetica-Bold',
-            spaceAfter=2
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='Duration',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=self.text_color,
-            fontName='Helvetica',
-            spaceAfter=6
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='BulletPoint',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=self.text_color,
-            fontName='Helvetica',
-            leftIndent=20,
-            bulletIndent=10,
-            spaceAfter=3
-        ))
-        
-        return styles
+        # A plain dict: the sample stylesheet already defines 'Title', so add() would reject ours
+        return {
+            'Normal': base['Normal'],
+            
+            # Header styles
+            'Name': ParagraphStyle(
+                name='Name',
+                parent=base['Heading1'],
+                fontSize=24,
+                textColor=self.primary_color,
+                fontName='Helvetica-Bold',
+                alignment=TA_CENTER,
+                spaceAfter=6
+            ),
+            'Title': ParagraphStyle(
+                name='Title',
+                parent=base['Normal'],
+                fontSize=14,
+                textColor=self.secondary_color,
+                fontName='Helvetica',
+                alignment=TA_CENTER,
+                spaceAfter=12
+            ),
+            'Contact': ParagraphStyle(
+                name='Contact',
+                parent=base['Normal'],
+                fontSize=10,
+                textColor=self.text_color,
+                fontName='Helvetica',
+                alignment=TA_CENTER,
+                spaceAfter=12
+            ),
+            
+            # Section styles
+            'SectionHeader': ParagraphStyle(
+                name='SectionHeader',
+                parent=base['Heading2'],
+                fontSize=14,
+                textColor=self.primary_color,
+                fontName='Helvetica-Bold',
+                spaceBefore=12,
+                spaceAfter=8,
+                borderWidth=0,
+                borderColor=self.primary_color,
+                borderPadding=4
+            ),
+            'JobTitle': ParagraphStyle(
+                name='JobTitle',
+                parent=base['Normal'],
+                fontSize=12,
+                textColor=self.text_color,
+                fontName='Helvetica-Bold',
+                spaceBefore=8,
+                spaceAfter=2
+            ),
+            'Company': ParagraphStyle(
+                name='Company',
+                parent=base['Normal'],
+                fontSize=11,
+                textColor=self.primary_color,
+                fontName='Helvetica-Bold',
+                spaceAfter=2
+            ),
+            'Duration': ParagraphStyle(
+                name='Duration',
+                parent=base['Normal'],
+                fontSize=10,
+                textColor=self.text_color,
+                fontName='Helvetica',
+                spaceAfter=6
+            ),
+            'BulletPoint': ParagraphStyle(
+                name='BulletPoint',
+                parent=base['Normal'],
+                fontSize=10,
+                textColor=self.text_color,
+                fontName='Helvetica',
+                leftIndent=20,
+                bulletIndent=10,
+                spaceAfter=3
+            ),
+        }
     
     def _add_header(self, story, resume_data, styles):
         """Add header with name and contact information"""
@@ -188,17 +211,12 @@ class PDFGenerator:
         story.append(Paragraph(title, styles['Title']))
         
         # Contact information
-        contact_info = []
-        if personal.get('email'):
-            contact_info.append(personal['email'])
-        if personal.get('phone'):
-            contact_info.append(personal['phone'])
-        if personal.get('location'):
-            contact_info.append(personal['location'])
-        if personal.get('linkedin'):
-            contact_info.append('LinkedIn Profile Available')
-        
-        contact_text = ' | '.join(contact_info)
+        contact_text = ' | '.join(filter(None, (
+            personal.get('email'),
+            personal.get('phone'),
+            personal.get('location'),
+            'LinkedIn Profile Available' if personal.get('linkedin') else None
+        )))
         story.append(Paragraph(contact_text, styles['Contact']))
     
     def _add_summary(self, story, resume_data, styles):
@@ -246,18 +264,19 @@ class PDFGenerator:
             story.append(Paragraph(f"{start_date} - {end_date}", styles['Duration']))
             
             # Responsibilities
-            responsibilities = exp.get('responsibilities', [])
-            for resp in responsibilities:
-                story.append(Paragraph(f"• {resp}", styles['BulletPoint']))
+            self._add_bullets(story, exp.get('responsibilities', []), styles)
             
             # Achievements
-            achievements = exp.get('achievements', [])
-            if achievements:
-                for achievement in achievements:
-                    story.append(Paragraph(f"⭐ {achievement}", styles['BulletPoint']))
+            self._add_bullets(story, exp.get('achievements', []), styles, marker='⭐')
             
             story.append(Spacer(1, 0.1*inch))
     
+    def _add_bullets(self, story, items, styles, marker='•'):
+        """Add a list of bullets as one paragraph, one <br/>-separated line per item"""
+        if items:
+            bullets_html = '<br/>'.join(f"{marker} {item}" for item in items)
+            story.append(Paragraph(bullets_html, styles['BulletPoint']))
+    
     def _add_education(self, story, resume_data, styles):
         """Add education information"""
         education = resume_data.get('education', [])
@@ -300,12 +319,13 @@ class PDFGenerator:
         
         story.append(Paragraph('TECHNICAL SKILLS', styles['SectionHeader']))
         
-        for category, skill_list in skills.items():
-            if skill_list:
-                category_name = category.replace('_', ' ').title()
-                skills_text = ', '.join(skill_list)
-                story.append(Paragraph(f"<b>{category_name}:</b> {skills_text}", styles['Normal']))
-                story.append(Spacer(1, 0.05*inch))
+        # One paragraph with a line per category instead of a paragraph and spacer each
+        skill_lines = [
+            f"<b>{_category_label(category)}:</b> {', '.join(skill_list)}"
+            for category, skill_list in skills.items() if skill_list
+        ]
+        if skill_lines:
+            story.append(Paragraph('<br/>'.join(skill_lines), styles['Normal']))
     
     def _add_projects(self, story, resume_data, styles):
         """Add projects section"""
@@ -328,9 +348,7 @@ class PDFGenerator:
                 tech_text = f"<b>Technologies:</b> {', '.join(technologies)}"
                 story.append(Paragraph(tech_text, styles['Normal']))
             
-            if achievements:
-                for achievement in achievements[:2]:  # Limit achievements
-                    story.append(Paragraph(f"• {achievement}", styles['BulletPoint']))
+            self._add_bullets(story, achievements[:2], styles)  # Limit achievements
             
             story.append(Spacer(1, 0.1*inch))
     
@@ -342,17 +360,19 @@ class PDFGenerator:
         
         story.append(Paragraph('CERTIFICATIONS', styles['SectionHeader']))
         
+        cert_lines = []
         for cert in certifications:
             name = cert.get('name', '')
             issuer = cert.get('issuer', '')
             date = cert.get('date', '')
             
-            cert_text = f"• {name}"
+            cert_text = name
             if issuer:
                 cert_text += f" - {issuer}"
             if date:
                 cert_text += f" ({date})"
-            
-            story.append(Paragraph(cert_text, styles['BulletPoint']))
+            cert_lines.append(cert_text)
+        
+        self._add_bullets(story, cert_lines, styles)
         
         story.append(Spacer(1, 0.1*inch))
\ No newline at end of file
@@ -1,18 +1,222 @@
 # backend/utils/text_processing.py
 import re
-import string
+import heapq
 import nltk
+import threading
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Any
 import logging
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; technology terms then use the fused regex
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import instead of being looked up in re's cache on every call
+_WS_RE = re.compile(r'\s+')
+_NONPUNCT_RE = re.compile(r'[^\w\s\.\,\!\?\-\(\)\/]')
+_DUP_PUNCT_RE = re.compile(r'([.!?]){2,}')
+# Anything one of the three substitutions above would change (any whitespace but a lone space counts)
+_NEEDS_CLEAN_RE = re.compile(r'[^\w .,!?\-()/]|\s{2,}|[.!?]{2,}')
+
+# Technology terms, matched case-insensitively as whole words
+_TECH_TERMS = (
+    'Python', 'JavaScript', 'Java', 'C++', 'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask',
+    'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'TensorFlow', 'PyTorch', 'scikit-learn', 'pandas', 'numpy',
+    'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Elasticsearch',
+    'Git', 'GitHub', 'GitLab', 'Jenkins', 'CI/CD', 'DevOps', 'Agile', 'Scrum'
+)
+
+# Fused into one alternation so the text is scanned once
+# Matches are case-insensitive; report each term in its canonical spelling
+_TECH_CANONICAL = {term.lower(): term for term in _TECH_TERMS}
+_TECH_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, _TECH_TERMS)) + r')\b', re.IGNORECASE)
+
+def _build_tech_automaton():
+    """Aho-Corasick automaton over the lowercased terms; values are (priority, length)"""
+    automaton = ahocorasick.Automaton()
+    for priority, term in enumerate(_TECH_TERMS):
+        automaton.add_word(term.lower(), (priority, len(term)))
+    automaton.make_automaton()
+    return automaton
+
+_TECH_AUTOMATON = _build_tech_automaton() if ahocorasick is not None else None
+
+def _is_word_char(char: str) -> bool:
+    """ASCII equivalent of the regex \\w class"""
+    return char.isalnum() or char == '_'
+
+def _find_tech_terms(text: str) -> List[str]:
+    """Technology terms in text, with the same matches _TECH_RE.finditer would give"""
+    # Lowercasing non-ASCII text can change its length, which would break match offsets
+    if _TECH_AUTOMATON is None or not text.isascii():
+        return [m.group(0) for m in _TECH_RE.finditer(text)]
+    
+    candidates = []
+    last = len(text) - 1
+    for end, (priority, length) in _TECH_AUTOMATON.iter(text.lower()):
+        start = end - length + 1
+        # \b on both sides: word-ness must change across each edge of the term
+        word_before = start > 0 and _is_word_char(text[start - 1])
+        word_after = end < last and _is_word_char(text[end + 1])
+        if word_before != _is_word_char(text[start]) and word_after != _is_word_char(text[end]):
+            candidates.append((start, priority, end))
+    
+    # Leftmost match wins, earlier terms first at the same position, and matches never overlap
+    matches = []
+    position = 0
+    for start, priority, end in sorted(candidates):
+        if start >= position:
+            matches.append(text[start:end + 1])
+            position = end + 1
+    return matches
+
+# Organization patterns (common company suffixes)
+_ORG_RE = re.compile(r'\b([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Company|Technologies|Systems|Solutions))\b')
+
+# Date patterns in one pass: Month Year, MM/YYYY or a bare year. The year inside a
+# longer date is reported on its own as well, as separate year matching would.
+_DATE_RE = re.compile(
+    r'\b(?:(?P<month_year>(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?P<month_year_year>\d{4}))'
+    r'|(?P<month_slash_year>\d{1,2}/(?P<slash_year>\d{4}))'
+    r'|(?P<year>\d{4}))\b',
+    re.IGNORECASE
+)
+
+# Question type keywords, checked in order
+_QUESTION_KEYWORDS = {
+    'experience': ('experience', 'work', 'job', 'role', 'position', 'career'),
+    'skills': ('skill', 'technology', 'tool', 'framework', 'language', 'tech'),
+    'education': ('education', 'degree', 'university', 'college', 'study', 'school'),
+    'projects': ('project', 'build', 'create', 'develop', 'portfolio'),
+    'personal': ('about', 'personality', 'hobby', 'interest', 'personal'),
+    'achievement': ('achievement', 'accomplish', 'award', 'recognition', 'success')
+}
+
+# Keyword -> (priority, type), so one pass over the words finds the first type in the order above
+_QUESTION_TYPE_INDEX = {
+    keyword: (rank, q_type)
+    for rank, (q_type, keywords) in reversed(list(enumerate(_QUESTION_KEYWORDS.items())))
+    for keyword in keywords
+}
+
+_QUESTION_WORDS = frozenset(('what', 'how', 'why', 'when', 'where', 'who', 'which'))
+
+# Tokenizers for short chat lines and resume snippets; far cheaper than NLTK's Punkt/Treebank
+_WORD_RE = re.compile(r"\w[\w'-]*")
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+# Maximal runs of word characters: the words a \b...\b keyword match can land on
+_WORD_RUN_RE = re.compile(r'\w+')
+
+_STOP_WORDS = None
+_STOP_WORDS_LOCK = threading.Lock()
+_NLTK_DOWNLOAD_ATTEMPTED = False
+
+def _get_stop_words() -> frozenset:
+    """English stopwords, loaded once (downloading the corpus on first use if needed)"""
+    global _STOP_WORDS, _NLTK_DOWNLOAD_ATTEMPTED
+    if _STOP_WORDS is None:
+        with _STOP_WORDS_LOCK:
+            if _STOP_WORDS is None:
+                from nltk.corpus import stopwords
+                try:
+                    words = stopwords.words('english')
+                except LookupError:
+                    # Only try the network once; later calls fail fast until the corpus is installed
+                    if _NLTK_DOWNLOAD_ATTEMPTED:
+                        raise
+                    _NLTK_DOWNLOAD_ATTEMPTED = True
+                    TextProcessor.setup_nltk()
+                    words = stopwords.words('english')
+                _STOP_WORDS = frozenset(words)
+    return _STOP_WORDS
+
+# Text analysis is deterministic per input, so repeated chat lines and the several
+# lookups made for one query reuse cached results. Cached values are immutable;
+# TextProcessor hands out fresh lists and dicts built from them.
+
+@lru_cache(maxsize=1024)
+def _clean_text(text: str) -> str:
+    """Clean and normalize a non-empty string"""
+    text = text.strip()
+    
+    # Most chat input is already clean; one search is cheaper than three substitutions
+    if not _NEEDS_CLEAN_RE.search(text):
+        return text
+    
+    # Remove extra whitespace
+    text = _WS_RE.sub(' ', text)
+    
+    # Remove special characters but keep basic punctuation
+    text = _NONPUNCT_RE.sub('', text)
+    
+    # Remove multiple consecutive punctuation
+    text = _DUP_PUNCT_RE.sub(r'\1', text)
+    
+    return text
+
+@lru_cache(maxsize=1024)
+def _extract_keywords(text: str, num_keywords: int) -> tuple:
+    """Most frequent non-stopword tokens of text"""
+    # Clean and tokenize
+    clean_text = _clean_text(text.lower()) if text else ""
+    tokens = _WORD_RE.findall(clean_text)
+    
+    # Remove stopwords and short words
+    stop_words = _get_stop_words()
+    keywords = [word for word in tokens 
+               if word not in stop_words 
+               and len(word) > 2]
+    
+    # Get most common keywords
+    keyword_freq = Counter(keywords)
+    return tuple(word for word, count in keyword_freq.most_common(num_keywords))
+
+@lru_cache(maxsize=1024)
+def _extract_entities(text: str) -> tuple:
+    """Regex-based entities of text as ((category, values), ...) pairs"""
+    # Sets dedupe as values are found
+    entities = {
+        'organizations': set(),
+        'technologies': set(),
+        'locations': set(),
+        'dates': set()
+    }
+    
+    entities['technologies'].update(_TECH_CANONICAL.get(term.lower(), term) for term in _find_tech_terms(text))
+    
+    entities['organizations'].update(_ORG_RE.findall(text))
+    
+    dates = entities['dates']
+    for m in _DATE_RE.finditer(text):
+        dates.add(m.group(0))
+        if m.lastgroup != 'year':
+            dates.add(m.group('month_year_year') or m.group('slash_year'))
+    
+    return tuple((key, tuple(values)) for key, values in entities.items())
+
+@lru_cache(maxsize=1024)
+def _classify_question(clean_input: str) -> tuple:
+    """(question type, word count, has question words) for cleaned chat input"""
+    words = _WORD_RUN_RE.findall(clean_input.lower())
+    
+    # Detect question type
+    matches = [_QUESTION_TYPE_INDEX[word] for word in words if word in _QUESTION_TYPE_INDEX]
+    question_type = min(matches)[1] if matches else "general"
+    
+    return question_type, len(clean_input.split()), not _QUESTION_WORDS.isdisjoint(words)
+
 class TextProcessor:
     def __init__(self):
         """Initialize text processing utilities"""
-        self.setup_nltk()
+        # NLTK data is fetched lazily by _get_stop_words, so construction never touches the network
     
-    def setup_nltk(self):
+    @staticmethod
+    def setup_nltk():
         """Download required NLTK data"""
         try:
             import ssl
@@ -23,9 +227,7 @@ class TextProcessor:
             else:
                 ssl._create_default_https_context = _create_unverified_https_context
             
-            nltk.download('punkt', quiet=True)
             nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
             logger.info("NLTK data downloaded successfully")
         except Exception as e:
             logger.warning(f"Failed to download NLTK data: {str(e)}")
@@ -34,40 +236,12 @@ class TextProcessor:
         """Clean and normalize text"""
         if not text or not isinstance(text, str):
             return ""
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\,\!\?\-\(\)\/]', '', text)
-        
-        # Remove multiple consecutive punctuation
-        text = re.sub(r'([.!?]){2,}', r'\1', text)
-        
-        return text
+        return _clean_text(text)
     
     def extract_keywords(self, text: str, num_keywords: int = 10) -> List[str]:
         """Extract keywords from text"""
         try:
-            from nltk.corpus import stopwords
-            from nltk.tokenize import word_tokenize
-            from collections import Counter
-            
-            # Clean and tokenize
-            clean_text = self.clean_text(text.lower())
-            tokens = word_tokenize(clean_text)
-            
-            # Remove stopwords and short words
-            stop_words = set(stopwords.words('english'))
-            keywords = [word for word in tokens 
-                       if word not in stop_words 
-                       and len(word) > 2 
-                       and word not in string.punctuation]
-            
-            # Get most common keywords
-            keyword_freq = Counter(keywords)
-            return [word for word, count in keyword_freq.most_common(num_keywords)]
-            
+            return list(_extract_keywords(text, num_keywords))
         except Exception as e:
             logger.error(f"Error extracting keywords: {str(e)}")
             return []
@@ -75,9 +249,7 @@ class TextProcessor:
     def summarize_text(self, text: str, max_sentences: int = 3) -> str:
         """Create a simple extractive summary"""
         try:
-            from nltk.tokenize import sent_tokenize
-            
-            sentences = sent_tokenize(text)
+            sentences = _SENT_SPLIT_RE.split(text.strip())
             
             if len(sentences) <= max_sentences:
                 return text
@@ -87,29 +259,19 @@ class TextProcessor:
             keyword_set = set(keywords)
             
             sentence_scores = []
-            for sentence in sentences:
-                score = 0
+            for i, sentence in enumerate(sentences):
                 words = sentence.lower().split()
                 
-                # Score based on keyword presence
-                for word in words:
-                    if word in keyword_set:
-                        score += 1
-                
-                # Normalize by sentence length
-                if len(words) > 0:
+                # Score based on keyword presence, normalized by sentence length
+                score = sum(1 for word in words if word in keyword_set)
+                if words:
                     score = score / len(words)
                 
-                sentence_scores.append((sentence, score))
+                sentence_scores.append((i, score))
             
-            # Sort by score and take top sentences
-            top_sentences = sorted(sentence_scores, key=lambda x: x[1], reverse=True)[:max_sentences]
-            
-            # Maintain original order
-            result_sentences = []
-            for sentence in sentences:
-                if any(sentence == s[0] for s in top_sentences):
-                    result_sentences.append(sentence)
+            # Take the top sentences (ties keep the earlier one), then restore their original order
+            top_sentences = heapq.nlargest(max_sentences, sentence_scores, key=lambda x: x[1])
+            result_sentences = [sentences[i] for i in sorted(i for i, _ in top_sentences)]
             
             return ' '.join(result_sentences)
             
@@ -120,46 +282,7 @@ class TextProcessor:
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """Extract named entities from text"""
         try:
-            # Simple regex-based entity extraction
-            entities = {
-                'organizations': [],
-                'technologies': [],
-                'locations': [],
-                'dates': []
-            }
-            
-            # Technology patterns
-            tech_patterns = [
-                r'\b(Python|JavaScript|Java|C\+\+|React|Angular|Vue|Node\.js|Django|Flask|Docker|Kubernetes|AWS|Azure|GCP|TensorFlow|PyTorch|scikit-learn|pandas|numpy)\b',
-                r'\b(SQL|NoSQL|MongoDB|PostgreSQL|MySQL|Redis|Elasticsearch)\b',
-                r'\b(Git|GitHub|GitLab|Jenkins|CI/CD|DevOps|Agile|Scrum)\b'
-            ]
-            
-            for pattern in tech_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                entities['technologies'].extend(matches)
-            
-            # Organization patterns (common company suffixes)
-            org_pattern = r'\b([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Company|Technologies|Systems|Solutions))\b'
-            entities['organizations'] = re.findall(org_pattern, text)
-            
-            # Date patterns
-            date_patterns = [
-                r'\b\d{4}\b',  # Years
-                r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\b',  # Month Year
-                r'\b\d{1,2}/\d{4}\b'  # MM/YYYY
-            ]
-            
-            for pattern in date_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                entities['dates'].extend(matches)
-            
-            # Remove duplicates
-            for key in entities:
-                entities[key] = list(set(entities[key]))
-            
-            return entities
-            
+            return {key: list(values) for key, values in _extract_entities(text)}
         except Exception as e:
             logger.error(f"Error extracting entities: {str(e)}")
             return {'organizations': [], 'technologies': [], 'locations': [], 'dates': []}
@@ -186,21 +309,7 @@ class TextProcessor:
         keywords = self.extract_keywords(clean_input, 5)
         entities = self.extract_entities(clean_input)
         
-        # Detect question type
-        question_patterns = {
-            'experience': r'\b(experience|work|job|role|position|career)\b',
-            'skills': r'\b(skill|technology|tool|framework|language|tech)\b',
-            'education': r'\b(education|degree|university|college|study|school)\b',
-            'projects': r'\b(project|build|create|develop|portfolio)\b',
-            'personal': r'\b(about|personality|hobby|interest|personal)\b',
-            'achievement': r'\b(achievement|accomplish|award|recognition|success)\b'
-        }
-        
-        question_type = "general"
-        for q_type, pattern in question_patterns.items():
-            if re.search(pattern, clean_input, re.IGNORECASE):
-                question_type = q_type
-                break
+        question_type, word_count, has_question_words = _classify_question(clean_input)
         
         return {
             'original_input': user_input,
@@ -208,8 +317,8 @@ class TextProcessor:
             'keywords': keywords,
             'entities': entities,
             'question_type': question_type,
-            'word_count': len(clean_input.split()),
-            'has_question_words': bool(re.search(r'\b(what|how|why|when|where|who|which)\b', clean_input, re.IGNORECASE))
+            'word_count': word_count,
+            'has_question_words': has_question_words
         }
     
     def generate_search_queries(self, user_input: str) -> List[str]:
@@ -359,15 +359,8 @@ async function generateDynamicResume() {
     try {
         showLoading();
         
-        const response = await fetch(`${API_BASE_URL}/api/download-resume`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                type: 'dynamic'
-            })
-        });
+        // GET so the browser cache can revalidate the PDF by its ETag instead of downloading it again
+        const response = await fetch(`${API_BASE_URL}/api/download-resume?type=dynamic`);
         
         if (response.ok) {
             const blob = await response.blob();